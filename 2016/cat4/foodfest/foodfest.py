@@ -5,24 +5,53 @@ import sys
 import typing
 
 
-def solve_task(budgets, food_trucks):
+def range_mask(low, high):
+    """Bitmask with bits low..high set, empty if the range is."""
+    low = max(low, 0)
+    if high < low:
+        return 0
+    return ((1 << (high - low + 1)) - 1) << low
+
 
-    # Optimization : stop when budget - new_spent > min_future_spends
-    # Stop when
+def reachable_sums(food_trucks, budgets):
+    """Returns a bitmask of the budgets that can be spent exactly by buying exactly
+    one item at every food truck: bit n is set if budget n is reachable.
 
-    amounts_spent = [0]
-    for prices in food_trucks:  # increasing
-        new_amounts = []
-        for price in prices:  # increasing
-            for spent in amounts_spent:
-                new_spent = spent + price
-                new_amounts.append(new_spent)
-        new_amounts = list(set(new_amounts))  # remove duplicates
-        amounts_spent = sorted(new_amounts)
+    After each truck, only partial sums that can still end on a budget are kept:
+    the remaining trucks add between their summed cheapest and summed most expensive
+    price, so a partial sum s survives only if some budget lies in
+    [s + min_rest, s + max_rest]. Stops early once no partial sum survives.
+    """
+    # min_rest[i] and max_rest[i]: least and most spent at trucks i and later
+    min_rest = [0] * (len(food_trucks) + 1)
+    max_rest = [0] * (len(food_trucks) + 1)
+    for i in range(len(food_trucks) - 1, -1, -1):
+        min_rest[i] = min_rest[i + 1] + min(food_trucks[i])
+        max_rest[i] = max_rest[i + 1] + max(food_trucks[i])
+
+    reachable = 1  # only 0 is spent before the first truck
+    for i, prices in enumerate(food_trucks):
+        new_reachable = 0
+        for price in set(prices):
+            new_reachable |= reachable << price
+        useful = 0
+        for budget in budgets:
+            useful |= range_mask(budget - max_rest[i + 1], budget - min_rest[i + 1])
+        reachable = new_reachable & useful
+        if not reachable:
+            break
+    in_budgets = 0
+    for budget in budgets:
+        in_budgets |= range_mask(budget, budget)
+    return reachable & in_budgets
+
+
+def solve_task(budgets, food_trucks):
+    amounts_spent = reachable_sums(food_trucks, budgets)
 
     solvable_budgets = []
     for budget in budgets:
-        if budget in amounts_spent:
+        if budget >= 0 and amounts_spent >> budget & 1:
             solvable_budgets.append(budget)
 
     if solvable_budgets:
@@ -1,55 +1,17 @@
 import sys
 import logging
 import datetime
+import pathlib
 
-sys.setrecursionlimit(1500)
-
-from functools import lru_cache
-
-@lru_cache(None)
-def is_winning_misere(piles):
-    # Base Case: If no stones are left, you "win" because 
-    # the opponent was forced to take the last stone.
-    if sum(piles) == 0:
-        return True
-
-    # Standard Minimax: Can I make a move that leaves my opponent in a losing state?
-    for i, count in enumerate(piles):
-        for take in range(1, count + 1):
-            next_state = list(piles)
-            next_state[i] -= take
-            
-            # Sort to keep the memoization table small
-            next_state_tuple = tuple(sorted(next_state))
-            
-            # If the move leads to a state where the opponent LOSES, you WIN
-            if not is_winning_misere(next_state_tuple):
-                return True
-                
-    return False
-
-
-def find_all_misere_winning_moves(initial_piles):
-    winning_moves = []
-    for i, count in enumerate(initial_piles):
-        for take in range(1, count + 1):
-            next_state = list(initial_piles)
-            next_state[i] -= take
-            
-            if not is_winning_misere(tuple(sorted(next_state))):
-                winning_moves.append(next_state)  
-    return winning_moves
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[3]))
+from nim import find_all_misere_winning_moves
 
 def process(rows: list[int]) -> list[list[int]]:
-    try:
-        moves = find_all_misere_winning_moves(rows)
-        if not moves:
-            return ["HOPELOOS"]
-        return sorted(moves)
-    except RecursionError:
-        logger.warning(f'Recursion error for {rows}')
-        return
-    
+    moves = find_all_misere_winning_moves(rows)
+    if not moves:
+        return ["HOPELOOS"]
+    return sorted(moves)
+
 
 if __name__ == "__main__":
     logger = logging.getLogger(__name__)
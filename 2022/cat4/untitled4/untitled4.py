@@ -1,14 +1,17 @@
-import bisect
+import pathlib
+import sys
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[3]))
+from fenwick import OrderStatistics
 
 
 def omphalos(array):
-    sorted_array = sorted(array)
+    remaining = OrderStatistics(array)
     output = []
-    for idx, number in enumerate(array):
-        number_smaller = bisect.bisect_left(sorted_array, number)
-        # number_smaller = sorted_array.index(number)
-        output.append(number_smaller)
-        sorted_array.pop(number_smaller)
+    for number in array:
+        # how many of the numbers still to come are smaller
+        output.append(remaining.rank(number))
+        remaining.remove(number)
     return output
 
 
@@ -1,4 +1,4 @@
-# Recursive
+# Dynamic programming
 
 from dataclasses import dataclass, field
 from typing import List
@@ -20,52 +20,49 @@ class Outcome:
             return "gelijk"
 
 
-def evaluate_sub_branch(
-    winning_numbers, current_number, options_a, options_b, alice_move: bool, move_history
-) -> Outcome:
-    if alice_move:
-        options = options_a
-        current_player = "a"
-        other_player = "b"
-    else:
-        options = options_b
-        current_player = "b"
-        other_player = "a"
+def solve(winning_numbers, start_number, options_a, options_b, debug=False) -> Outcome:
+    """Outcome of the game for Alice ("a") moving first from start_number.
 
-    outcomes = []
-    for move in options:
-        new_number = current_number + move
-        move_history += f"{current_player}{move}->{new_number} "
-        if new_number > max(winning_numbers):
-            return Outcome(winner="g")
-        if new_number in winning_numbers:
-            outcome = Outcome(winner=current_player, numbers=[new_number])
-        else:
-            outcome = evaluate_sub_branch(
-                winning_numbers, new_number, options_a, options_b, not alice_move, move_history
-            )
-        outcomes.append(outcome)
-    if outcomes[0].winner == current_player or outcomes[1].winner == current_player:
-        winning_numbers = []
-        if outcomes[0].winner == current_player:
-            winning_numbers.extend(outcomes[0].numbers)
-        if outcomes[1].winner == current_player:
-            winning_numbers.extend(outcomes[1].numbers)
-        print(move_history + f" ({current_player})")
-        return Outcome(winner=current_player, numbers=winning_numbers)
-    elif outcomes[0].winner == "g" or outcomes[1].winner == "g":
-        print(move_history + " (g)")
+    Every number from max(winning_numbers) down to start_number is evaluated once per
+    player to move, using the already computed outcomes of the higher numbers, so the
+    work is linear in the number range. A move past max(winning_numbers) leads to a
+    draw, a move onto a winning number wins for the player making it. A player picks a
+    winning move if there is one, else a draw if there is one, else loses. The numbers
+    of an outcome are the winning numbers the winner can end on.
+    """
+    if any(move <= 0 for move in options_a + options_b):
+        raise ValueError("Moves must be positive")
+    winning = set(winning_numbers)
+    max_number = max(winning_numbers)
+    # table[player][number - start_number] = (winner, numbers) for player to move at number
+    size = max(max_number - start_number + 1, 0)
+    table = {"a": [None] * size, "b": [None] * size}
+    players = (("a", "b", options_a), ("b", "a", options_b))
+    for current_number in range(max_number, start_number - 1, -1):
+        for current_player, other_player, options in players:
+            outcomes = []
+            for move in options:
+                new_number = current_number + move
+                if new_number > max_number:
+                    outcomes.append(("g", frozenset()))
+                elif new_number in winning:
+                    outcomes.append((current_player, frozenset([new_number])))
+                else:
+                    outcomes.append(table[other_player][new_number - start_number])
+            winners = [winner for winner, _ in outcomes]
+            if current_player in winners:
+                outcome = (current_player, frozenset().union(*(numbers for winner, numbers in outcomes if winner == current_player)))
+            elif "g" in winners:
+                outcome = ("g", frozenset())
+            else:
+                outcome = (other_player, frozenset().union(*(numbers for winner, numbers in outcomes if winner == other_player)))
+            table[current_player][current_number - start_number] = outcome
+            if debug:
+                print(f"{current_player} at {current_number} -> {outcome[0]} {sorted(outcome[1])}")
+    if size == 0:
         return Outcome(winner="g")
-    elif outcomes[0].winner == other_player or outcomes[1].winner == other_player:
-        winning_numbers = []
-        if outcomes[0].winner == other_player:
-            winning_numbers.extend(outcomes[0].numbers)
-        if outcomes[1].winner == other_player:
-            winning_numbers.extend(outcomes[1].numbers)
-        print(move_history + f" ({other_player})")
-        return Outcome(winner=other_player, numbers=winning_numbers)
-    else:
-        raise ValueError("Should not get here")
+    winner, numbers = table["a"][0]
+    return Outcome(winner=winner, numbers=sorted(numbers))
 
 
 if __name__ == "__main__":
@@ -88,8 +85,7 @@ if __name__ == "__main__":
         start_getal = int(parts[0])
         options_a = [int(parts[1]), int(parts[2])]
         options_b = [int(parts[3]), int(parts[4])]
-        alice_move = True
-        resultaat = evaluate_sub_branch(winstgetallen, start_getal, options_a, options_b, alice_move, f"{start_getal} ")
+        resultaat = solve(winstgetallen, start_getal, options_a, options_b)
         print(resultaat)
         lines_out.append(f"{i+1} {resultaat}\n")
         line_idx += 1
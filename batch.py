@@ -0,0 +1,60 @@
+import os
+import logging
+import multiprocessing
+import typing
+
+logger = logging.getLogger(__name__)
+
+# Below this many tasks, run_batch solves in the current process: starting workers costs more than it saves
+POOL_MIN_TASKS = 1000
+# Target number of chunks handed to every worker, trades scheduling overhead against load balance
+CHUNKS_PER_WORKER = 4
+
+# Set once per worker by _init_worker, so the function isn't pickled with every chunk
+_worker_process = None
+
+def _init_worker(process: typing.Callable, initializer: typing.Union[None, typing.Callable], initargs: tuple) -> None:
+    global _worker_process
+    _worker_process = process
+    if initializer is not None:
+        initializer(*initargs)
+
+def _run_indexed(indexed_task: tuple[int, tuple]) -> tuple[int, typing.Any]:
+    index, task = indexed_task
+    return index, _worker_process(*task)
+
+def run_batch(process: typing.Callable, tasks: typing.Sequence[tuple], processes: typing.Union[None, int] = None, chunksize: typing.Union[None, int] = None, initializer: typing.Union[None, typing.Callable] = None, initargs: tuple = ()) -> list:
+    """Runs process(*task) for every task over a bounded worker pool and returns the results in task order.
+
+    Workers live for the whole batch, so module-level memo caches (e.g. lru_cache) warm up across
+    all tasks a worker solves. Tasks are submitted in chunks and may finish in any order; results
+    are put back at their entry index, so printing them gives deterministic output.
+
+    Args:
+        process: Top-level (picklable) function solving one task.
+        tasks: Argument tuples, one per entry.
+        processes: Number of workers. Defaults to the CPU count for at least POOL_MIN_TASKS tasks,
+            otherwise 1. With 1 worker the tasks are solved in the current process.
+        chunksize: Tasks per submitted chunk, defaults to about CHUNKS_PER_WORKER chunks per worker.
+        initializer: Called with initargs once in every worker, e.g. to load shared tables.
+        initargs: Arguments for initializer.
+
+    Returns:
+        list: process(*tasks[i]) at index i.
+    """
+    if processes is None:
+        processes = os.cpu_count() if len(tasks) >= POOL_MIN_TASKS else 1
+    processes = max(1, min(processes, len(tasks)))
+    if processes == 1:
+        if initializer is not None:
+            initializer(*initargs)
+        return [process(*task) for task in tasks]
+
+    if chunksize is None:
+        chunksize = max(1, len(tasks) // (CHUNKS_PER_WORKER * processes))
+    logger.info(f'Solving {len(tasks)} tasks on {processes} workers in chunks of {chunksize}')
+    results = [None] * len(tasks)
+    with multiprocessing.Pool(processes, initializer=_init_worker, initargs=(process, initializer, initargs)) as pool:
+        for index, result in pool.imap_unordered(_run_indexed, enumerate(tasks), chunksize=chunksize):
+            results[index] = result
+    return results
@@ -0,0 +1,126 @@
+import bisect
+import typing
+
+
+class FenwickTree:
+    """Binary indexed tree over positions 0..size-1 with point updates and prefix sums in O(log size).
+
+    Args:
+        counts: Initial value per position, the tree is built from it in O(size).
+    """
+
+    def __init__(self, counts: typing.Sequence[int]):
+        self.size = len(counts)
+        # 1-based: tree[i] holds the sum of positions [i - lowbit(i), i)
+        tree = [0] + list(counts)
+        for i in range(1, self.size + 1):
+            parent = i + (i & -i)
+            if parent <= self.size:
+                tree[parent] += tree[i]
+        self.tree = tree
+        self.top_bit = 1 << (self.size.bit_length() - 1) if self.size else 0
+
+    def add(self, index: int, delta: int) -> None:
+        """Adds delta to position index."""
+        tree = self.tree
+        size = self.size
+        i = index + 1
+        while i <= size:
+            tree[i] += delta
+            i += i & -i
+
+    def prefix_sum(self, end: int) -> int:
+        """Sum of positions [0, end)."""
+        tree = self.tree
+        total = 0
+        i = end
+        while i > 0:
+            total += tree[i]
+            i &= i - 1
+        return total
+
+    def search(self, target: int) -> int:
+        """Smallest index with prefix_sum(index + 1) > target, for non-negative values; size if there is none."""
+        tree = self.tree
+        size = self.size
+        position = 0
+        step = self.top_bit
+        while step:
+            candidate = position + step
+            if candidate <= size and tree[candidate] <= target:
+                position = candidate
+                target -= tree[candidate]
+            step >>= 1
+        return position
+
+
+class OrderStatistics:
+    """Multiset of values with count, rank, select and deletion in O(log n), over a coordinate-compressed FenwickTree.
+
+    Only values from the universe given at construction can ever be stored.
+
+    Args:
+        values: Initial contents.
+        universe: All values that may be inserted later, defaults to the initial values.
+    """
+
+    def __init__(self, values: typing.Iterable = (), universe: typing.Union[None, typing.Iterable] = None):
+        values = list(values)
+        self.keys = sorted(set(values if universe is None else universe))
+        self.key_index = {key: index for index, key in enumerate(self.keys)}
+        counts = [0] * len(self.keys)
+        for value in values:
+            counts[self.key_index[value]] += 1
+        self.counts = counts
+        self.tree = FenwickTree(counts)
+        self.length = len(values)
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __contains__(self, value) -> bool:
+        return self.count(value) > 0
+
+    def count(self, value) -> int:
+        """Number of copies of value."""
+        index = self.key_index.get(value)
+        return 0 if index is None else self.counts[index]
+
+    def insert(self, value, copies: int = 1) -> None:
+        index = self.key_index[value]
+        self.counts[index] += copies
+        self.tree.add(index, copies)
+        self.length += copies
+
+    def remove(self, value) -> None:
+        """Removes one copy of value, raises KeyError if there is none."""
+        index = self.key_index.get(value)
+        if index is None or not self.counts[index]:
+            raise KeyError(value)
+        self.counts[index] -= 1
+        self.tree.add(index, -1)
+        self.length -= 1
+
+    def rank(self, value) -> int:
+        """Number of stored values strictly smaller than value."""
+        index = self.key_index.get(value)
+        if index is None:
+            index = bisect.bisect_left(self.keys, value)
+        return self.tree.prefix_sum(index)
+
+    def select(self, k: int):
+        """The k-th smallest stored value, 0-based, raises IndexError if k is out of range."""
+        if not 0 <= k < self.length:
+            raise IndexError(k)
+        return self.keys[self.tree.search(k)]
+
+
+def count_inversions(array: typing.Sequence) -> int:
+    """Number of pairs i < j with array[i] > array[j], in O(n log n)."""
+    seen = OrderStatistics(universe=array)
+    inversions = 0
+    for i, value in enumerate(array):
+        # values seen so far that are not <= value
+        inversions += i - seen.rank(value) - seen.count(value)
+        seen.insert(value)
+    return inversions
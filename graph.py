@@ -1,19 +1,32 @@
-import sys
+"""Shared graph library for the solvers in this repository.
+
+Solvers in the year folders import it by putting the repository root on sys.path:
+
+    sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[3]))
+    from graph import Edge, Graph
+"""
+import array
 import logging
-import datetime
 import dataclasses
 import heapq
-import multiprocessing
+import itertools
 import collections
 import typing
 
-@dataclasses.dataclass
+logger = logging.getLogger(__name__)
+
+# Source of the unique ids (Edge.uid) that Edge uses for hashing and equality. Not to be confused with
+# the edge ids of CompiledGraph, which are positions in Graph.edges
+_edge_uids = itertools.count()
+
+@dataclasses.dataclass(frozen=True, slots=True, eq=False)
 class Edge:
     node_a: str
     node_b: str
     weight: int
     bidirectional: bool = True
     mandatory: bool = False
+    uid: int = dataclasses.field(init=False, default_factory=_edge_uids.__next__, repr=False)
 
     def start_nodes(self) -> list[str]:
         if self.bidirectional:
@@ -26,26 +39,31 @@ class Edge:
         return self.node_a
 
     def __hash__(self) -> int:
-        return hash((self.node_a, self.node_b, self.weight, self.bidirectional, self.mandatory))
+        return self.uid
     
     def __eq__(self, other) -> bool:
         if not isinstance(other, Edge):
             return False
-        return self.node_a == other.node_a and self.node_b == other.node_b and self.weight == other.weight and self.bidirectional == other.bidirectional and self.mandatory == other.mandatory
+        return self.uid == other.uid
     
     def __repr__(self) -> str:
         return f'{self.node_a} -> {self.node_b} ({self.weight})'
     
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class Path:
     edges: list[Edge]
     nodes: list[str]
+    # Summed edge weight, computed once at construction. Build a new Path rather than changing edges.
+    cached_distance: int = dataclasses.field(init=False, repr=False)
+
+    def __post_init__(self):
+        self.cached_distance = sum([edge.weight for edge in self.edges])
 
     def distance(self) -> int:
-        return sum([edge.weight for edge in self.edges])
+        return self.cached_distance
     
     def min_est_distance(self) -> int:
-        return self.distance()
+        return self.cached_distance
     
     def __lt__(self, other: typing.Self) -> bool:
         return self.min_est_distance() < other.min_est_distance()
@@ -53,10 +71,280 @@ class Path:
     def __repr__(self) -> str:
         return ', '.join([f'{self.nodes[i-1]} -> {self.nodes[i]} ({self.edges[i-1].weight})' for i in range(1, len(self.nodes))])
     
+@dataclasses.dataclass(slots=True)
+class PathNode:
+    """Persistent, parent-linked path: each step shares its prefix with its parent."""
+    node: str
+    distance: int = 0
+    edge: typing.Union[Edge, None] = None
+    parent: typing.Union['PathNode', None] = None
+
+    def to_path(self) -> Path:
+        edges = []
+        nodes = []
+        current = self
+        while current is not None:
+            nodes.append(current.node)
+            if current.edge is not None:
+                edges.append(current.edge)
+            current = current.parent
+        return Path(list(reversed(edges)), list(reversed(nodes)))
+
+
+class CompiledGraph:
+    """Integer-indexed, read-only view of a Graph in CSR (compressed sparse row) layout.
+
+    Node names are interned to dense ids 0..n-1. The outgoing arcs of node i are
+    stored at positions offsets[i]:offsets[i+1] of the flat `targets` and
+    `edge_ids` arrays and the `weights` list (a list, so float and arbitrarily
+    large weights keep working). A bidirectional Edge yields one arc in each direction;
+    `edge_ids` points back into Graph.edges so results can be mapped back to Edge
+    objects.
+    """
+
+    def __init__(self, edges: list[Edge]):
+        self.node_names: list[typing.Any] = []
+        self.node_index: dict[typing.Any, int] = {}
+        arcs = []
+        for edge_id, edge in enumerate(edges):
+            node_a = self.intern(edge.node_a)
+            node_b = self.intern(edge.node_b)
+            arcs.append((node_a, node_b, edge.weight, edge_id))
+            if edge.bidirectional:
+                arcs.append((node_b, node_a, edge.weight, edge_id))
+        self.pack(arcs)
+
+    def pack(self, arcs: list[tuple[int, int, int, int]]) -> None:
+        """Fills the CSR arrays from (source, target, weight, edge_id) arcs."""
+        # Counting sort of the arcs by source node
+        nodes_count = len(self.node_names)
+        self.offsets = array.array('i', [0] * (nodes_count + 1))
+        for source, _, _, _ in arcs:
+            self.offsets[source + 1] += 1
+        for i in range(nodes_count):
+            self.offsets[i + 1] += self.offsets[i]
+        self.targets = array.array('i', [0] * len(arcs))
+        self.weights = [0] * len(arcs)
+        self.edge_ids = array.array('i', [0] * len(arcs))
+        fill = array.array('i', self.offsets[:-1])
+        for source, target, weight, edge_id in arcs:
+            position = fill[source]
+            self.targets[position] = target
+            self.weights[position] = weight
+            self.edge_ids[position] = edge_id
+            fill[source] += 1
+
+    def arcs(self) -> typing.Iterator[tuple[int, int, int, int]]:
+        for source in range(len(self.node_names)):
+            for position in range(self.offsets[source], self.offsets[source + 1]):
+                yield source, self.targets[position], self.weights[position], self.edge_ids[position]
+
+    def transpose(self) -> 'CompiledGraph':
+        """Returns a CompiledGraph with every arc reversed, sharing the node ids."""
+        transposed = CompiledGraph([])
+        transposed.node_names = self.node_names
+        transposed.node_index = self.node_index
+        transposed.pack([(target, source, weight, edge_id) for source, target, weight, edge_id in self.arcs()])
+        return transposed
+
+    def distances_from(self, source_id: int) -> list[float]:
+        """Dijkstra from one node to all nodes; requires non-negative weights."""
+        distances = [float('inf')] * len(self.node_names)
+        distances[source_id] = 0
+        frontier = [(0, source_id)]
+        while frontier:
+            distance, node_id = heapq.heappop(frontier)
+            if distance > distances[node_id]:
+                continue
+            for position in range(self.offsets[node_id], self.offsets[node_id + 1]):
+                dest_id = self.targets[position]
+                new_distance = distance + self.weights[position]
+                if new_distance < distances[dest_id]:
+                    distances[dest_id] = new_distance
+                    heapq.heappush(frontier, (new_distance, dest_id))
+        return distances
+
+    def intern(self, node: typing.Any) -> int:
+        node_id = self.node_index.get(node)
+        if node_id is None:
+            node_id = len(self.node_names)
+            self.node_index[node] = node_id
+            self.node_names.append(node)
+        return node_id
+
+    def __len__(self) -> int:
+        return len(self.node_names)
+
+    def degree(self, node_id: int) -> int:
+        return self.offsets[node_id + 1] - self.offsets[node_id]
+
+    def neighbours(self, node_id: int) -> array.array:
+        return self.targets[self.offsets[node_id]:self.offsets[node_id + 1]]
+
+    def neighbour_masks(self) -> list[int]:
+        """Undirected neighbourhoods as int bitmasks: bit j of masks[i] is set if i and j share an edge."""
+        masks = [0] * len(self.node_names)
+        for source, target, _, _ in self.arcs():
+            if source != target:
+                masks[source] |= 1 << target
+                masks[target] |= 1 << source
+        return masks
+
+    def degeneracy_order(self, masks: list[int]) -> list[int]:
+        """Repeatedly removes a node of minimum remaining degree, returning the removal order."""
+        degrees = [mask.bit_count() for mask in masks]
+        frontier = [(degree, node_id) for node_id, degree in enumerate(degrees)]
+        heapq.heapify(frontier)
+        removed = 0
+        order = []
+        while frontier:
+            degree, node_id = heapq.heappop(frontier)
+            if removed >> node_id & 1 or degree != degrees[node_id]:
+                continue
+            removed |= 1 << node_id
+            order.append(node_id)
+            remaining = masks[node_id] & ~removed
+            while remaining:
+                lowest = remaining & -remaining
+                neighbour = lowest.bit_length() - 1
+                remaining ^= lowest
+                degrees[neighbour] -= 1
+                heapq.heappush(frontier, (degrees[neighbour], neighbour))
+        return order
+
+
+class MandatoryEdgeLowerBound:
+    """Admissible lower bound on the remaining cost of a mandatory-edge walk.
+
+    For a state (mask, node) with uncovered mandatory edges U, any walk that 
+    still has to cover U and finish at `end` consists of:
+        - a segment from node to the first edge of U it traverses,
+        - the traversal of every edge in U (their summed weight),
+        - a segment between consecutive edges of U, for all but the first,
+        - a segment from the last edge of U to `end`.
+    Each segment is bounded from below by the cheapest shortest-path connection 
+    it could use, using all-pairs distances between the mandatory edge 
+    endpoints and the target, computed once up front. The mask-only parts are 
+    cached per mask. Requires non-negative weights.
+    """
+
+    def __init__(self, graph: 'Graph', end: str):
+        compiled = graph.compiled()
+        self.mandatory_edges = [edge for edge in graph.edges if edge.mandatory]
+        # Entry and exit node ids of every mandatory edge
+        self.entries = []
+        self.exits = []
+        for edge in self.mandatory_edges:
+            node_a = compiled.node_index[edge.node_a]
+            node_b = compiled.node_index[edge.node_b]
+            self.entries.append((node_a, node_b) if edge.bidirectional else (node_a,))
+            self.exits.append((node_a, node_b) if edge.bidirectional else (node_b,))
+        # distances_to[t][u] is the shortest distance from node u to node t
+        transposed = compiled.transpose()
+        interesting = {node_id for entries in self.entries for node_id in entries}
+        end_id = compiled.node_index.get(end)
+        if end_id is not None:
+            interesting.add(end_id)
+        self.distances_to = {node_id: transposed.distances_from(node_id) for node_id in interesting}
+        self.to_end = self.distances_to[end_id] if end_id is not None else [float('inf')] * len(compiled)
+        self.mask_bounds: dict[int, tuple[list[int], float]] = {}
+
+    def distance(self, sources: tuple[int], targets: tuple[int]) -> float:
+        return min(self.distances_to[target][source] for source in sources for target in targets)
+
+    def mask_bound(self, mask: int) -> tuple[list[int], float]:
+        """Returns the uncovered edge indices and the node-independent part of the bound."""
+        if mask in self.mask_bounds:
+            return self.mask_bounds[mask]
+        uncovered = [i for i in range(len(self.mandatory_edges)) if not mask >> i & 1]
+        bound = float(sum(self.mandatory_edges[i].weight for i in uncovered))
+        if uncovered:
+            # Every uncovered edge except the first is entered from the exit of another one
+            connections = [
+                min((self.distance(self.exits[j], self.entries[i]) for j in uncovered if j != i), default=0)
+                for i in uncovered
+            ]
+            bound += sum(sorted(connections)[:-1])
+            bound += min(min(self.to_end[node_id] for node_id in self.exits[i]) for i in uncovered)
+        self.mask_bounds[mask] = uncovered, bound
+        return uncovered, bound
+
+    def __call__(self, mask: int, node_id: int) -> float:
+        uncovered, bound = self.mask_bound(mask)
+        if not uncovered:
+            return self.to_end[node_id]
+        return bound + min(self.distances_to[entry][node_id] for i in uncovered for entry in self.entries[i])
+
+
 class Graph:
     def __init__(self, edges: list[Edge]):
         self.edges = edges
         self.edgemap = self.build_edge_map(edges)
+        self._compiled = None
+
+    @classmethod
+    def from_edge_list(cls, edge_list: typing.Iterable[tuple], bidirectional: bool = True) -> 'Graph':
+        """Builds a graph from (node_a, node_b) or (node_a, node_b, weight) tuples; the weight defaults to 1."""
+        edges = []
+        for node_a, node_b, *weight in edge_list:
+            edges.append(Edge(node_a, node_b, weight[0] if weight else 1, bidirectional=bidirectional))
+        return cls(edges)
+
+    @classmethod
+    def from_adjacency_matrix(cls, matrix: typing.Sequence[typing.Sequence[int]], nodes: typing.Sequence[typing.Any] = None, no_edge: typing.Any = 0, symmetric: bool = False) -> 'Graph':
+        """
+        Builds a graph from a square matrix where matrix[i][j] is the weight of the edge i -> j.
+
+        Args:
+            matrix: The adjacency matrix.
+            nodes: Names for the rows/columns. Defaults to 0..n-1.
+            no_edge: The matrix value meaning "no edge". The diagonal is always skipped.
+            symmetric: Read only the upper triangle and create bidirectional edges.
+        """
+        if nodes is None:
+            nodes = range(len(matrix))
+        edges = []
+        for i, row in enumerate(matrix):
+            for j in range(i + 1 if symmetric else 0, len(row)):
+                if i == j or row[j] == no_edge:
+                    continue
+                edges.append(Edge(nodes[i], nodes[j], row[j], bidirectional=symmetric))
+        return cls(edges)
+
+    @classmethod
+    def from_grid(cls, grid: typing.Sequence[typing.Sequence[typing.Any]], passable: typing.Callable[[typing.Any], bool] = None, include_diagonals: bool = False, weight: int = 1) -> 'Graph':
+        """
+        Builds a graph over the cells of a 2D grid. Nodes are (row, column) tuples 
+        and every pair of adjacent passable cells gets a bidirectional edge.
+
+        Args:
+            grid: A 2D sequence of cell values.
+            passable: Predicate on a cell value. Defaults to all cells being passable.
+            include_diagonals: Whether diagonally adjacent cells are connected.
+            weight: The weight of every edge.
+        """
+        if passable is None:
+            passable = lambda value: True
+        # Only look forward, so every pair is added once
+        directions = [(0, 1), (1, 0)]
+        if include_diagonals:
+            directions += [(1, 1), (1, -1)]
+        edges = []
+        for i, row in enumerate(grid):
+            for j, value in enumerate(row):
+                if not passable(value):
+                    continue
+                for di, dj in directions:
+                    ni, nj = i + di, j + dj
+                    if 0 <= ni < len(grid) and 0 <= nj < len(grid[ni]) and passable(grid[ni][nj]):
+                        edges.append(Edge((i, j), (ni, nj), weight))
+        return cls(edges)
+
+    def compiled(self) -> CompiledGraph:
+        """Returns the CSR representation of this graph, building it on first use."""
+        if self._compiled is None:
+            self._compiled = CompiledGraph(self.edges)
+        return self._compiled
 
     def __repr__(self) -> str:
         return ', '.join(map(str, [edge for edge in self.edges]))
@@ -69,11 +357,11 @@ class Graph:
         return nodes
     
     def neigbouring_nodes(self, node: str) -> set[str]:
-        neighbours = set()
-        for edge in self.edgemap[node]:
-            neighbour = edge.other_end(node)
-            neighbours.add(neighbour)
-        return neighbours
+        compiled = self.compiled()
+        node_id = compiled.node_index.get(node)
+        if node_id is None:
+            return set()
+        return {compiled.node_names[neighbour] for neighbour in compiled.neighbours(node_id)}
 
     def build_edge_map(self, edges: list[Edge]) -> dict[str, list[Edge]]:
         edgemap = collections.defaultdict(list)
@@ -87,67 +375,341 @@ class Graph:
         if visited_nodes is None:
             visited_nodes = set()
         visited_nodes.add(node)
-        for edge in self.edgemap[node]:
-            dest_node = edge.other_end(node)
-            if dest_node in visited_nodes:
-                continue
-            self.reachable_nodes_dfs(node=dest_node, visited_nodes=visited_nodes)
+        compiled = self.compiled()
+        if node not in compiled.node_index:
+            return visited_nodes
+        offsets, targets = compiled.offsets, compiled.targets
+        visited = bytearray(len(compiled))
+        for visited_node in visited_nodes:
+            if visited_node in compiled.node_index:
+                visited[compiled.node_index[visited_node]] = 1
+        stack = [compiled.node_index[node]]
+        while stack:
+            node_id = stack.pop()
+            for position in range(offsets[node_id], offsets[node_id + 1]):
+                dest_id = targets[position]
+                if visited[dest_id]:
+                    continue
+                visited[dest_id] = 1
+                visited_nodes.add(compiled.node_names[dest_id])
+                stack.append(dest_id)
         return visited_nodes
     
-    def state_space_search(self, end: str, frontier: tuple[float, list[Path]] = None) -> tuple[int, Path]:
+    def traversal_order(self, start: str, breadth_first: bool = False) -> array.array:
         """
-        Performs a state-space search using a priority queue to find the shortest 
-        path that satisfies all mandatory edge requirements.
+        Visits every node reachable from start with an explicit stack (DFS) or 
+        queue (BFS), so long chains cannot hit the recursion limit.
 
-        The algorithm explores the graph by treating the combination of (visited edges, 
-        current node) as a unique state. This allows it to solve complex routing 
-        problems where the same node might be visited multiple times to satisfy 
-        edge constraints.
+        Returns:
+            The visited node ids (see compiled()) in visiting order. Empty if start 
+            is not in the graph.
+        """
+        compiled = self.compiled()
+        order = array.array('i')
+        if start not in compiled.node_index:
+            return order
+        offsets, targets = compiled.offsets, compiled.targets
+        visited = bytearray(len(compiled))
+        start_id = compiled.node_index[start]
+        if breadth_first:
+            visited[start_id] = 1
+            queue = collections.deque([start_id])
+            while queue:
+                node_id = queue.popleft()
+                order.append(node_id)
+                for position in range(offsets[node_id], offsets[node_id + 1]):
+                    dest_id = targets[position]
+                    if not visited[dest_id]:
+                        visited[dest_id] = 1
+                        queue.append(dest_id)
+            return order
+        stack = [start_id]
+        while stack:
+            node_id = stack.pop()
+            if visited[node_id]:
+                continue
+            visited[node_id] = 1
+            order.append(node_id)
+            # Push in reverse so the visiting order follows the adjacency order
+            for position in range(offsets[node_id + 1] - 1, offsets[node_id] - 1, -1):
+                if not visited[targets[position]]:
+                    stack.append(targets[position])
+        return order
 
-        Args:
-            frontier: A list used as a min-heap (via heapq) containing tuples of 
-                (estimated_total_distance, Path).
-            end: The target node identifier to reach.
+    def hop_distances(self, start: str) -> array.array:
+        """Breadth-first number of edges from start to every node id, -1 if unreachable."""
+        compiled = self.compiled()
+        distances = array.array('i', [-1] * len(compiled))
+        if start not in compiled.node_index:
+            return distances
+        offsets, targets = compiled.offsets, compiled.targets
+        queue = collections.deque([compiled.node_index[start]])
+        distances[queue[0]] = 0
+        while queue:
+            node_id = queue.popleft()
+            for position in range(offsets[node_id], offsets[node_id + 1]):
+                dest_id = targets[position]
+                if distances[dest_id] < 0:
+                    distances[dest_id] = distances[node_id] + 1
+                    queue.append(dest_id)
+        return distances
+
+    def connected_components(self) -> array.array:
+        """
+        Labels the weakly connected components with union-find (path halving, 
+        union by size). Edge directions are ignored.
 
         Returns:
-            A tuple of (min_distance, optimal_path):
-                - min_distance (float): The total weight of the shortest path found 
-                that covers all mandatory edges. Defaults to infinity if none found.
-                - optimal_path (Path or None): The Path object containing the sequence 
-                of edges and nodes. Returns None if no valid path reaches the end.
-
-        Notes:
-            - The algorithm utilizes a `state_memo` dictionary to prune paths that 
-            reach the same state (same edges traversed and same current node) 
-            with a higher cost.
-            - Validity is strictly defined by the inclusion of all edges in the 
-            graph marked as `mandatory`.
+            An array mapping every node id to a component label 0..k-1.
         """
-        if frontier is None:
-            frontier = [(0, Path([], [start]))]
-        min_distance=float('inf')
-        optimal_path = None
-        state_memo = dict()
-        while(frontier):
-            _, most_promising_path = heapq.heappop(frontier)
-            if most_promising_path.min_est_distance() >= min_distance:
+        compiled = self.compiled()
+        nodes_count = len(compiled)
+        parents = array.array('i', range(nodes_count))
+        sizes = array.array('i', [1] * nodes_count)
+
+        def find(node_id: int) -> int:
+            while parents[node_id] != node_id:
+                parents[node_id] = parents[parents[node_id]]
+                node_id = parents[node_id]
+            return node_id
+
+        for source, target, _, _ in compiled.arcs():
+            root_a, root_b = find(source), find(target)
+            if root_a == root_b:
                 continue
-            state = (frozenset(most_promising_path.edges), most_promising_path.nodes[-1])
-            distance = most_promising_path.distance()
-            if state in state_memo and state_memo[state] <= distance:
+            if sizes[root_a] < sizes[root_b]:
+                root_a, root_b = root_b, root_a
+            parents[root_b] = root_a
+            sizes[root_a] += sizes[root_b]
+        labels = array.array('i', [-1] * nodes_count)
+        root_labels = {}
+        for node_id in range(nodes_count):
+            labels[node_id] = root_labels.setdefault(find(node_id), len(root_labels))
+        return labels
+
+    def strongly_connected_components(self) -> array.array:
+        """
+        Labels the strongly connected components with an iterative version of 
+        Tarjan's algorithm. Labels are assigned in reverse topological order of 
+        the condensation: a component only has edges to lower-labelled ones.
+
+        Returns:
+            An array mapping every node id to a component label 0..k-1.
+        """
+        compiled = self.compiled()
+        nodes_count = len(compiled)
+        offsets, targets = compiled.offsets, compiled.targets
+        indices = array.array('i', [-1] * nodes_count)
+        low_links = array.array('i', [0] * nodes_count)
+        labels = array.array('i', [-1] * nodes_count)
+        on_stack = bytearray(nodes_count)
+        component_stack = []
+        index = 0
+        label = 0
+        for root in range(nodes_count):
+            if indices[root] >= 0:
                 continue
-            state_memo[state] = distance
-            if most_promising_path.nodes[-1] == end:
-                if all([mandatory_edge in most_promising_path.edges for mandatory_edge in self.edges if mandatory_edge.mandatory]):
-                    if distance < min_distance:
-                        min_distance = distance
-                        optimal_path = most_promising_path
+            # Each call frame is (node_id, next arc position)
+            call_stack = [(root, offsets[root])]
+            indices[root] = low_links[root] = index
+            index += 1
+            component_stack.append(root)
+            on_stack[root] = 1
+            while call_stack:
+                node_id, position = call_stack[-1]
+                if position < offsets[node_id + 1]:
+                    call_stack[-1] = (node_id, position + 1)
+                    dest_id = targets[position]
+                    if indices[dest_id] < 0:
+                        indices[dest_id] = low_links[dest_id] = index
+                        index += 1
+                        component_stack.append(dest_id)
+                        on_stack[dest_id] = 1
+                        call_stack.append((dest_id, offsets[dest_id]))
+                    elif on_stack[dest_id] and indices[dest_id] < low_links[node_id]:
+                        low_links[node_id] = indices[dest_id]
                     continue
-            for edge in self.edgemap[most_promising_path.nodes[-1]]:
-                next_path = Path(most_promising_path.edges + [edge], most_promising_path.nodes + [edge.other_end(most_promising_path.nodes[-1])])
-                heapq.heappush(frontier, (next_path.min_est_distance(), next_path))
-        return min_distance, optimal_path
-    
+                call_stack.pop()
+                if call_stack and low_links[node_id] < low_links[call_stack[-1][0]]:
+                    low_links[call_stack[-1][0]] = low_links[node_id]
+                if low_links[node_id] == indices[node_id]:
+                    while True:
+                        member = component_stack.pop()
+                        on_stack[member] = 0
+                        labels[member] = label
+                        if member == node_id:
+                            break
+                    label += 1
+        return labels
+
+    def bipartite_colouring(self) -> typing.Union[array.array, None]:
+        """
+        Two-colours the graph with an iterative BFS, ignoring edge directions.
+
+        Returns:
+            An array mapping every node id to colour 0 or 1, or None if the graph 
+            is not bipartite (it contains an odd cycle).
+        """
+        compiled = self.compiled()
+        nodes_count = len(compiled)
+        transposed = compiled.transpose()
+        colours = array.array('b', [-1] * nodes_count)
+        for root in range(nodes_count):
+            if colours[root] >= 0:
+                continue
+            colours[root] = 0
+            queue = collections.deque([root])
+            while queue:
+                node_id = queue.popleft()
+                for adjacency in (compiled, transposed):
+                    for position in range(adjacency.offsets[node_id], adjacency.offsets[node_id + 1]):
+                        dest_id = adjacency.targets[position]
+                        if colours[dest_id] < 0:
+                            colours[dest_id] = 1 - colours[node_id]
+                            queue.append(dest_id)
+                        elif colours[dest_id] == colours[node_id]:
+                            return None
+        return colours
+
+    def dijkstra(self, start: str, end: str, heuristic: typing.Callable[[str], float] = None) -> tuple[float, typing.Union[Path, None]]:
+        """
+        Computes the shortest path between two nodes using Dijkstra's algorithm, 
+        or A* when a heuristic is given.
+
+        Only predecessor pointers are stored per node, so memory is O(V) and the 
+        complexity is O((V + E) log V). All edge weights must be non-negative.
+
+        Args:
+            start: The node to start from.
+            end: The target node.
+            heuristic: Optional function mapping a node to a lower bound of its 
+                remaining distance to `end`. It must be admissible (never 
+                overestimate) and consistent for the result to be optimal.
+
+        Returns:
+            A tuple of (distance, path). If `end` cannot be reached, the distance 
+            is float('inf') and the path is None.
+        """
+        if start == end:
+            return 0, Path([], [start])
+        compiled = self.compiled()
+        if start not in compiled.node_index or end not in compiled.node_index:
+            return float('inf'), None
+        offsets, targets, weights, edge_ids = compiled.offsets, compiled.targets, compiled.weights, compiled.edge_ids
+        start_id = compiled.node_index[start]
+        end_id = compiled.node_index[end]
+        # Heuristic values are computed when a node is first pushed and cached, so A* never
+        # evaluates the heuristic on the part of the graph it does not reach
+        estimates = [0 if heuristic is None else None] * len(compiled)
+        if heuristic is not None:
+            estimates[start_id] = heuristic(start)
+        distances = [float('inf')] * len(compiled)
+        used_edge_ids = [-1] * len(compiled)
+        predecessors = [-1] * len(compiled)
+        settled = bytearray(len(compiled))
+        distances[start_id] = 0
+        frontier = [(estimates[start_id], start_id)]
+        while frontier:
+            _, node_id = heapq.heappop(frontier)
+            if settled[node_id]:
+                continue
+            settled[node_id] = 1
+            if node_id == end_id:
+                break
+            distance = distances[node_id]
+            for position in range(offsets[node_id], offsets[node_id + 1]):
+                dest_id = targets[position]
+                new_distance = distance + weights[position]
+                if new_distance < distances[dest_id]:
+                    distances[dest_id] = new_distance
+                    used_edge_ids[dest_id] = edge_ids[position]
+                    predecessors[dest_id] = node_id
+                    if estimates[dest_id] is None:
+                        estimates[dest_id] = heuristic(compiled.node_names[dest_id])
+                    heapq.heappush(frontier, (new_distance + estimates[dest_id], dest_id))
+        if not settled[end_id]:
+            return float('inf'), None
+        # Backtrack over the predecessor pointers to build the path
+        path_nodes = [end]
+        path_edges = []
+        node_id = end_id
+        while node_id != start_id:
+            path_edges.append(self.edges[used_edge_ids[node_id]])
+            node_id = predecessors[node_id]
+            path_nodes.append(compiled.node_names[node_id])
+        return distances[end_id], Path(list(reversed(path_edges)), list(reversed(path_nodes)))
+
+    def mandatory_edge_search(self, start: str, end: str, heuristic: typing.Callable[[int, int], float] = None) -> tuple[float, typing.Union[Path, None]]:
+        """
+        Finds the shortest walk from start to end that traverses every mandatory 
+        edge at least once.
+
+        The search runs Dijkstra over states (mandatory_edges_bitmask, node), where 
+        bit i of the mask is set once the i-th mandatory edge has been traversed. 
+        Paths are kept as parent-linked PathNodes with a cached cumulative 
+        distance, so expanding a state is O(degree) instead of O(path length). 
+        All edge weights must be non-negative.
+
+        With a heuristic the search becomes A*: states are ordered by distance 
+        plus the lower bound, and states whose bound is infinite are pruned.
+
+        Args:
+            start: The node to start from.
+            end: The target node identifier to reach.
+            heuristic: Optional admissible lower bound, called as 
+                heuristic(mask, node_id), e.g. a MandatoryEdgeLowerBound.
+
+        Returns:
+            A tuple of (min_distance, optimal_path). If no walk covers all 
+            mandatory edges, the distance is float('inf') and the path is None.
+        """
+        compiled = self.compiled()
+        mandatory_bits = [0] * len(self.edges)
+        mandatory_count = 0
+        for edge_id, edge in enumerate(self.edges):
+            if edge.mandatory:
+                mandatory_bits[edge_id] = 1 << mandatory_count
+                mandatory_count += 1
+        full_mask = (1 << mandatory_count) - 1
+        if start not in compiled.node_index or end not in compiled.node_index:
+            if start == end and full_mask == 0:
+                return 0, Path([], [start])
+            return float('inf'), None
+        offsets, targets, weights, edge_ids = compiled.offsets, compiled.targets, compiled.weights, compiled.edge_ids
+        nodes_count = len(compiled)
+        start_id = compiled.node_index[start]
+        end_id = compiled.node_index[end]
+
+        if heuristic is None:
+            heuristic = lambda mask, node_id: 0
+
+        # States are encoded as mask * nodes_count + node_id
+        best_distances = {start_id: 0}
+        counter = 0
+        frontier = [(heuristic(0, start_id), counter, start_id, PathNode(start))]
+        while frontier:
+            _, _, state, path_node = heapq.heappop(frontier)
+            distance = path_node.distance
+            if best_distances[state] < distance:
+                continue
+            mask, node_id = divmod(state, nodes_count)
+            if node_id == end_id and mask == full_mask:
+                return distance, path_node.to_path()
+            for position in range(offsets[node_id], offsets[node_id + 1]):
+                dest_id = targets[position]
+                edge_id = edge_ids[position]
+                new_distance = distance + weights[position]
+                new_state = (mask | mandatory_bits[edge_id]) * nodes_count + dest_id
+                if new_distance < best_distances.get(new_state, float('inf')):
+                    estimate = heuristic(new_state // nodes_count, dest_id)
+                    if estimate == float('inf'):
+                        continue
+                    best_distances[new_state] = new_distance
+                    counter += 1
+                    next_path_node = PathNode(compiled.node_names[dest_id], new_distance, self.edges[edge_id], path_node)
+                    heapq.heappush(frontier, (new_distance + estimate, counter, new_state, next_path_node))
+        return float('inf'), None
+
     def bellman_ford(self, start:str) -> tuple[typing.Union[dict[str, float], float], typing.Union[dict[str, Edge], None]]:
         """
         Computes the shortest paths from a starting node to all other nodes using 
@@ -173,40 +735,186 @@ class Graph:
             is the number of edges. This is slower than Dijkstra's but necessary 
             for graphs with negative edge weights.
         """
-        # Helper to get all directed versions of the edges
-        def get_all_directed():
-            for edge in self.edges:
-                yield (edge, edge.node_a, edge.node_b, edge.weight)
-                if edge.bidirectional:
-                    yield (edge, edge.node_b, edge.node_a, edge.weight)
-
-        nodes_count = len(self.get_nodes())
-        distances = {node: float('inf') for node in self.get_nodes()}
-        used_edges = {node: None for node in self.get_nodes()}
-        distances[start] = 0
+        compiled = self.compiled()
+        nodes_count = len(compiled)
+        offsets, targets, weights, edge_ids = compiled.offsets, compiled.targets, compiled.weights, compiled.edge_ids
+        distances = [float('inf')] * nodes_count
+        used_edge_ids = [-1] * nodes_count
+        if start in compiled.node_index:
+            distances[compiled.node_index[start]] = 0
         updates = True
         for _ in range(nodes_count):
             if not updates:
                 break
             updates = False
-            for edge, node_a, node_b, weight in get_all_directed():
-                if distances[node_a] != float('inf') and distances[node_a] + weight < distances[node_b]:
-                    distances[node_b] = distances[node_a] + weight
-                    used_edges[node_b] = edge
-                    updates = True
-        for _, node_a, node_b, weight in get_all_directed():
-            if distances[node_a] != float('inf') and distances[node_a] + weight < distances[node_b]:
-                return float('-inf'), None
-        return distances, used_edges
-
-    def shortest_path(self, start: str, end: str) -> tuple[int, Path]:
-        # If any edge weight under 0, use bellman-ford
+            for node_a in range(nodes_count):
+                distance_a = distances[node_a]
+                if distance_a == float('inf'):
+                    continue
+                for position in range(offsets[node_a], offsets[node_a + 1]):
+                    node_b = targets[position]
+                    if distance_a + weights[position] < distances[node_b]:
+                        distances[node_b] = distance_a + weights[position]
+                        used_edge_ids[node_b] = edge_ids[position]
+                        updates = True
+        for node_a in range(nodes_count):
+            if distances[node_a] == float('inf'):
+                continue
+            for position in range(offsets[node_a], offsets[node_a + 1]):
+                if distances[node_a] + weights[position] < distances[targets[position]]:
+                    return float('-inf'), None
+        node_names = compiled.node_names
+        return (
+            {node_names[node_id]: distance for node_id, distance in enumerate(distances)},
+            {node_names[node_id]: self.edges[edge_id] if edge_id >= 0 else None for node_id, edge_id in enumerate(used_edge_ids)},
+        )
+
+    def spfa(self, start: str) -> tuple[typing.Union[dict[str, float], float], typing.Union[dict[str, Edge], None]]:
+        """
+        Computes the shortest paths from a starting node to all other nodes using 
+        the queue-based Shortest Path Faster Algorithm.
+
+        Only the out-edges of nodes whose distance changed are relaxed again. A 
+        negative cycle is detected as soon as a shortest path would need V or 
+        more edges, instead of after a full extra round over all edges.
+
+        Args:
+            start: The identifier (name or ID) of the source node to start from.
+
+        Returns:
+            The same (distances, used_edges) tuple as bellman_ford, including 
+            (float('-inf'), None) when a negative cycle is reachable from start.
+
+        Note:
+            The worst case is still O(V * E), but on sparse updates (such as DAG-like 
+            graphs) most nodes are relaxed only a few times.
+        """
+        compiled = self.compiled()
+        nodes_count = len(compiled)
+        offsets, targets, weights, edge_ids = compiled.offsets, compiled.targets, compiled.weights, compiled.edge_ids
+        distances = [float('inf')] * nodes_count
+        used_edge_ids = [-1] * nodes_count
+        # Number of edges on the current shortest path to each node
+        path_lengths = [0] * nodes_count
+        in_queue = bytearray(nodes_count)
+        queue = collections.deque()
+        if start in compiled.node_index:
+            start_id = compiled.node_index[start]
+            distances[start_id] = 0
+            queue.append(start_id)
+            in_queue[start_id] = 1
+        while queue:
+            node_a = queue.popleft()
+            in_queue[node_a] = 0
+            distance_a = distances[node_a]
+            for position in range(offsets[node_a], offsets[node_a + 1]):
+                node_b = targets[position]
+                if distance_a + weights[position] < distances[node_b]:
+                    distances[node_b] = distance_a + weights[position]
+                    used_edge_ids[node_b] = edge_ids[position]
+                    path_lengths[node_b] = path_lengths[node_a] + 1
+                    if path_lengths[node_b] >= nodes_count:
+                        return float('-inf'), None
+                    if not in_queue[node_b]:
+                        in_queue[node_b] = 1
+                        queue.append(node_b)
+        node_names = compiled.node_names
+        return (
+            {node_names[node_id]: distance for node_id, distance in enumerate(distances)},
+            {node_names[node_id]: self.edges[edge_id] if edge_id >= 0 else None for node_id, edge_id in enumerate(used_edge_ids)},
+        )
+
+    def topological_order(self) -> typing.Union[array.array, None]:
+        """
+        Orders the nodes topologically using Kahn's algorithm.
+
+        Returns:
+            An array of node ids (see compiled()) in topological order, or None 
+            if the graph contains a cycle. A bidirectional edge counts as a cycle.
+        """
+        compiled = self.compiled()
+        nodes_count = len(compiled)
+        offsets, targets = compiled.offsets, compiled.targets
+        in_degrees = array.array('i', [0] * nodes_count)
+        for target in targets:
+            in_degrees[target] += 1
+        order = array.array('i', [node_id for node_id in range(nodes_count) if in_degrees[node_id] == 0])
+        index = 0
+        while index < len(order):
+            node_a = order[index]
+            index += 1
+            for position in range(offsets[node_a], offsets[node_a + 1]):
+                node_b = targets[position]
+                in_degrees[node_b] -= 1
+                if in_degrees[node_b] == 0:
+                    order.append(node_b)
+        if len(order) < nodes_count:
+            return None
+        return order
+
+    def dag_shortest_path(self, start: str, longest: bool = False, order: array.array = None) -> tuple[dict[str, float], dict[str, Edge]]:
+        """
+        Computes single-source shortest (or longest) paths in an acyclic graph 
+        with one relaxation pass in topological order, in O(V + E).
+
+        Args:
+            start: The identifier (name or ID) of the source node to start from.
+            longest: Compute longest instead of shortest paths.
+            order: A precomputed topological_order(). Computed when omitted.
+
+        Returns:
+            The same (distances, used_edges) dictionaries as bellman_ford. 
+            Unreachable nodes get float('inf'), or float('-inf') when longest.
+
+        Raises:
+            ValueError: If the graph contains a cycle.
+        """
+        if order is None:
+            order = self.topological_order()
+        if order is None:
+            raise ValueError('dag_shortest_path requires an acyclic graph')
+        compiled = self.compiled()
+        nodes_count = len(compiled)
+        offsets, targets, weights, edge_ids = compiled.offsets, compiled.targets, compiled.weights, compiled.edge_ids
+        # Longest paths are shortest paths over negated weights
+        sign = -1 if longest else 1
+        distances = [float('inf')] * nodes_count
+        used_edge_ids = [-1] * nodes_count
+        if start in compiled.node_index:
+            distances[compiled.node_index[start]] = 0
+        for node_a in order:
+            distance_a = distances[node_a]
+            if distance_a == float('inf'):
+                continue
+            for position in range(offsets[node_a], offsets[node_a + 1]):
+                node_b = targets[position]
+                if distance_a + sign * weights[position] < distances[node_b]:
+                    distances[node_b] = distance_a + sign * weights[position]
+                    used_edge_ids[node_b] = edge_ids[position]
+        node_names = compiled.node_names
+        return (
+            {node_names[node_id]: sign * distance for node_id, distance in enumerate(distances)},
+            {node_names[node_id]: self.edges[edge_id] if edge_id >= 0 else None for node_id, edge_id in enumerate(used_edge_ids)},
+        )
+
+    def shortest_path(self, start: str, end: str, heuristic: typing.Callable[[str], float] = None, negative_weight_algorithm: str = 'spfa') -> tuple[int, Path]:
+        # If any edge weight under 0, use a topological pass on DAGs, else spfa or bellman-ford
         if any([edge.weight < 0 for edge in self.edges]):
-            logger.debug('starting bellman ford')
-            distances, used_edges = self.bellman_ford(start)
+            order = self.topological_order()
+            if order is not None:
+                logger.debug('starting dag shortest path')
+                distances, used_edges = self.dag_shortest_path(start, order=order)
+            elif negative_weight_algorithm == 'spfa':
+                logger.debug('starting spfa')
+                distances, used_edges = self.spfa(start)
+            elif negative_weight_algorithm == 'bellman_ford':
+                logger.debug('starting bellman ford')
+                distances, used_edges = self.bellman_ford(start)
+            else:
+                raise ValueError(f'Unknown negative weight algorithm: {negative_weight_algorithm}')
             if isinstance(distances, float):
                 return distances, None
-            if isinstance(distances[end], float):
+            if distances[end] == float('inf'):
                 return distances[end], None
             # Bellman ford found a distance, backtrack to find path
             path_nodes = [end]
@@ -218,100 +926,148 @@ class Graph:
                 path_edges.append(used_edge)
             path = Path(list(reversed(path_edges)), list(reversed(path_nodes)))
             return distances[end], path
-        # Else use state-space search using branch and bound.
+        # Without mandatory edges, a plain single-pair search is enough.
+        elif not any(edge.mandatory for edge in self.edges):
+            logger.debug('starting dijkstra')
+            return self.dijkstra(start, end, heuristic=heuristic)
+        # Else search over (covered mandatory edges, node) states.
         else:
-            logger.debug('starting state space search')
-            distance, path =  self.state_space_search(end=end)
+            logger.debug('starting mandatory edge search')
+            lower_bound = MandatoryEdgeLowerBound(self, end)
+            distance, path = self.mandatory_edge_search(start, end, heuristic=lower_bound)
             return distance, path
 
     def bron_kerbosch(self) -> typing.List[typing.Set[typing.Any]]:
         """Finds all maximal cliques in the graph using the Bron-Kerbosch algorithm.
 
-        This implementation uses a pivoting strategy to prune the search space, 
-        making it significantly more efficient for large, sparse graphs. A maximal 
-        clique is a clique that cannot be extended by adding another adjacent vertex.
+        Neighbourhoods are precomputed once as int bitmasks, so P and X are 
+        bitmasks too and every set operation is a single `&`. The outer loop 
+        follows a degeneracy ordering, and each recursion uses Tomita pivoting 
+        (the pivot from P ∪ X with the most neighbours in P). Edge directions 
+        are ignored. A maximal clique is a clique that cannot be extended by 
+        adding another adjacent vertex.
 
         Returns:
             A list of sets, where each set contains the nodes forming a maximal clique.
         """
+        compiled = self.compiled()
+        neighbours = compiled.neighbour_masks()
         cliques: typing.List[typing.Set[typing.Any]] = []
-        r: typing.Set[typing.Any] = set()
-        p: typing.Set[typing.Any] = set(self.edgemap.keys())
-        x: typing.Set[typing.Any] = set()
 
-        def bron_kerbosch_helper(r: typing.Set[typing.Any], p: typing.Set[typing.Any], x: typing.Set[typing.Any], cliques: typing.List[typing.Set[typing.Any]]):
+        def to_nodes(mask: int) -> typing.Set[typing.Any]:
+            nodes = set()
+            while mask:
+                lowest = mask & -mask
+                nodes.add(compiled.node_names[lowest.bit_length() - 1])
+                mask ^= lowest
+            return nodes
+
+        def bron_kerbosch_helper(r: int, p: int, x: int):
             """Recursive helper that performs the backtracking search with pivoting.
 
             Args:
-                r: The current growing clique (Results).
-                p: Potential candidates that can be added to the clique.
-                x: Excluded vertices that have already been processed in this branch.
-                cliques: The accumulator list where found maximal cliques are stored.
+                r: The current growing clique (Results), as a bitmask.
+                p: Potential candidates that can be added to the clique, as a bitmask.
+                x: Excluded vertices that have already been processed in this branch, as a bitmask.
             """
             # If both P and X are empty, R is a maximal clique
             if not p and not x:
-                cliques.append(r)
+                cliques.append(to_nodes(r))
                 return
-            
+
             # If P is empty but X is not, this branch cannot yield a maximal clique
             if not p:
                 return
-            
-            # Select a pivot to minimize the number of recursive calls. 
-            # The pivot is chosen from (P ∪ X) to maximize neighbors in P.
-            pivot = max(p | x, key=lambda u: len(self.neigbouring_nodes(u) & p))
+
+            # Select a pivot from (P ∪ X) that maximizes neighbors in P.
+            pivot_neighbours = 0
+            best_count = -1
+            candidates = p | x
+            while candidates:
+                lowest = candidates & -candidates
+                candidates ^= lowest
+                count = (neighbours[lowest.bit_length() - 1] & p).bit_count()
+                if count > best_count:
+                    best_count = count
+                    pivot_neighbours = neighbours[lowest.bit_length() - 1]
 
             # Iterate only through nodes in P that are NOT neighbors of the pivot
-            for node in list(p - self.neigbouring_nodes(pivot)):
-                bron_kerbosch_helper(
-                    r | {node},
-                    p & self.neigbouring_nodes(node),
-                    x & self.neigbouring_nodes(node),
-                    cliques
-                )
+            remaining = p & ~pivot_neighbours
+            while remaining:
+                lowest = remaining & -remaining
+                remaining ^= lowest
+                node_neighbours = neighbours[lowest.bit_length() - 1]
+                bron_kerbosch_helper(r | lowest, p & node_neighbours, x & node_neighbours)
                 # Move the node from 'Potential' to 'Excluded'
-                p.remove(node)
-                x.add(node)
+                p ^= lowest
+                x |= lowest
 
-        bron_kerbosch_helper(r, p, x, cliques)
+        # Nodes without any edge are never part of a clique
+        if not any(neighbours):
+            return [set()]
+        processed = 0
+        for node_id in compiled.degeneracy_order(neighbours):
+            if not neighbours[node_id]:
+                continue
+            bit = 1 << node_id
+            bron_kerbosch_helper(bit, neighbours[node_id] & ~processed, neighbours[node_id] & processed)
+            processed |= bit
         return cliques
 
+    def max_clique_size(self) -> int:
+        """Returns the size of the largest clique, without enumerating all maximal cliques.
+
+        Uses branch and bound over bitmask neighbourhoods: candidates are greedily 
+        coloured, and since a clique holds at most one node per colour class, the 
+        number of colours bounds the clique size reachable from a branch. Branches 
+        that cannot beat the best clique found so far are cut. Edge directions are 
+        ignored.
+        """
+        compiled = self.compiled()
+        neighbours = compiled.neighbour_masks()
+        # Renumber the nodes in reverse degeneracy order, so the greedy colouring sees dense nodes first
+        order = list(reversed(compiled.degeneracy_order(neighbours)))
+        position = {node_id: index for index, node_id in enumerate(order)}
+        masks = [0] * len(order)
+        for node_id in order:
+            mask = neighbours[node_id]
+            while mask:
+                lowest = mask & -mask
+                mask ^= lowest
+                masks[position[node_id]] |= 1 << position[lowest.bit_length() - 1]
+        best = 1 if compiled.node_names else 0
+
+        def colour_sort(p: int) -> tuple[list[int], list[int]]:
+            """Greedy colouring of P, returning the nodes and their colour numbers by increasing colour."""
+            nodes = []
+            colours = []
+            colour = 0
+            uncoloured = p
+            while uncoloured:
+                colour += 1
+                q = uncoloured
+                while q:
+                    lowest = q & -q
+                    node_id = lowest.bit_length() - 1
+                    q &= ~masks[node_id] & ~lowest
+                    uncoloured ^= lowest
+                    nodes.append(node_id)
+                    colours.append(colour)
+            return nodes, colours
+
+        def expand(size: int, p: int):
+            nonlocal best
+            nodes, colours = colour_sort(p)
+            for index in range(len(nodes) - 1, -1, -1):
+                if size + colours[index] <= best:
+                    return
+                node_id = nodes[index]
+                new_p = p & masks[node_id]
+                if new_p:
+                    expand(size + 1, new_p)
+                elif size + 1 > best:
+                    best = size + 1
+                p &= ~(1 << node_id)
 
-if __name__ == "__main__":
-    logger = logging.getLogger(__name__)
-    logging.basicConfig(stream=sys.stderr, level=logging.INFO)
-    if len(sys.argv) <= 1:
-        logger.info('No arguments, reading from standard input')
-        input_lines = sys.stdin.readlines()
-    else:
-        logger.info(f'Arguments provided, reading {sys.argv[1]}')
-        with open(sys.argv[1], 'r') as input_file:
-            input_lines = input_file.readlines()
-
-    starttime = datetime.datetime.now()
-
-    number_of_entries = int(input_lines[0].strip())
-    logger.info(f'Number of entries: {number_of_entries}')
-
-    line_index = 1
-    for i in range(number_of_entries):
-        logger.info(f'Reading entry {i+1} out of {number_of_entries}')
-        
-        # Start of parsing
-        height, width = tuple(map(int,input_lines[line_index].strip().split()))
-        logger.info(f'{height=}, {width=}')
-        line_index += 1
-        matrix = []
-        for j in range(height):
-            row = tuple(map(int, input_lines[line_index].strip().split()))
-            matrix.append(row)
-            line_index += 1
-        # End of parsing
-
-        # Start of processing
-        output_line = max(max((len(clicque) for clicque in max_clicques)),1)
-        logger.debug(f'Output: {i + 1} {output_line}')
-        print(f'{i + 1} {output_line}', flush=True)
-        # End of processing
-            
-    logger.info(f'Done. Time elapsed: {datetime.datetime.now() - starttime}')
\ No newline at end of file
+        expand(0, (1 << len(order)) - 1)
+        return best
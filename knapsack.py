@@ -1,41 +1,332 @@
 import sys
 import logging
 import datetime
+import bisect
 import dataclasses
 import typing
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+logger = logging.getLogger(__name__)
+
+# Largest capacity slab (number of cells) solve_n_knapsack_01 hands to the dense NumPy kernel
+DENSE_MAX_CELLS = 10 ** 7
+# Largest dp table (values plus decision bits, in bytes) the solvers build, beyond it they switch to branch and bound
+DP_MAX_BYTES = 10 ** 9
+# Above this many items, branch and bound warns that its search may take exponential time
+BRANCH_AND_BOUND_MAX_ITEMS = 60
+# Up to this many items, solve_1_knapsack_01 prefers meet in the middle over branch and bound for huge capacities
+MEET_IN_THE_MIDDLE_MAX_ITEMS = 40
+
 @dataclasses.dataclass
 class Item:
     value: int
     requirements: tuple[int]
+    # how many copies are available, None for unbounded. The _01 solvers ignore it.
+    count: typing.Union[None, int] = 1
+
+def solve_dense_knapsack_01(capacities: tuple[int], items: list[Item]) -> tuple[int, tuple[Item]]:
+    """0/1 knapsack over a dense NumPy slab of every capacity vector up to `capacities`.
+
+    Each item is one vectorized update: the slab shifted by the item's requirements plus its 
+    value is compared to the slab, and the improved cells are taken. The improved cells are 
+    kept as packed bits per item for backtracking. Works for any number of dimensions.
+    """
+    dp = numpy.zeros(tuple(capacity + 1 for capacity in capacities), dtype=numpy.int64)
+    decisions = []
+    for current_item in items:
+        requirements = current_item.requirements
+        if any(requirement > capacity for requirement, capacity in zip(requirements, capacities)):
+            decisions.append(None)
+            continue
+        target = tuple(slice(requirement, None) for requirement in requirements)
+        source = tuple(slice(0, capacity + 1 - requirement) for capacity, requirement in zip(capacities, requirements))
+        take = dp[source] + current_item.value
+        improved = take > dp[target]
+        dp[target] = numpy.where(improved, take, dp[target])
+        decisions.append((numpy.packbits(improved, axis=None), improved.shape))
+    value_to_return = int(dp[tuple(capacities)])
+    # backtrack from the full capacities, last item first, following the improved bits
+    items_to_return = ()
+    current_capacities = list(capacities)
+    for current_item_index in range(len(items) - 1, -1, -1):
+        if decisions[current_item_index] is None:
+            continue
+        bits, shape = decisions[current_item_index]
+        item = items[current_item_index]
+        offsets = tuple(capacity - requirement for capacity, requirement in zip(current_capacities, item.requirements))
+        if any(offset < 0 for offset in offsets):
+            continue
+        flat_index = int(numpy.ravel_multi_index(offsets, shape))
+        if not bits[flat_index >> 3] >> (7 - (flat_index & 7)) & 1:
+            continue
+        items_to_return += (item,)
+        current_capacities = list(offsets)
+    return value_to_return, items_to_return
+
+def solve_branch_and_bound_knapsack_01(capacities: tuple[int], items: list[Item]) -> tuple[int, tuple[Item]]:
+    """0/1 knapsack by depth-first branch and bound, independent of the size of the capacities.
+
+    Items are explored by decreasing value density (value per share of the capacities), trying to 
+    take an item before skipping it. A branch is cut when its LP-relaxation bound cannot beat the 
+    incumbent. With several constraints, the bound is the smallest of the fractional (Dantzig) 
+    bounds of the single-constraint relaxations, each of which is a valid upper bound.
+    """
+    dimensions = range(len(capacities))
+    # items with no value, or that can never fit, are never part of an optimal solution
+    candidates = [
+        item for item in items
+        if item.value > 0 and all(item.requirements[k] <= capacities[k] for k in dimensions)
+    ]
+
+    def density(item: Item, k: typing.Union[None, int] = None) -> float:
+        if k is None:
+            share = sum(item.requirements[k] / capacities[k] for k in dimensions if capacities[k])
+        else:
+            share = item.requirements[k]
+        return item.value / share if share else float('inf')
+
+    if len(candidates) > BRANCH_AND_BOUND_MAX_ITEMS:
+        logger.warning(f'Branch and bound over {len(candidates)} items, the search may take exponential time')
+    candidates.sort(key=density, reverse=True)
+    values = [item.value for item in candidates]
+    requirements = [item.requirements for item in candidates]
+    # per dimension, the candidate positions by decreasing density in that dimension
+    orders = [sorted(range(len(candidates)), key=lambda position: density(candidates[position], k), reverse=True) for k in dimensions]
+
+    def upper_bound(position: int, value: int, remaining: list[int]) -> float:
+        bound = float('inf')
+        for k in dimensions:
+            capacity = remaining[k]
+            relaxed_value = value
+            for candidate in orders[k]:
+                if candidate < position:
+                    continue
+                requirement = requirements[candidate][k]
+                if requirement <= capacity:
+                    capacity -= requirement
+                    relaxed_value += values[candidate]
+                else:
+                    relaxed_value += values[candidate] * capacity / requirement
+                    break
+            bound = min(bound, relaxed_value)
+        return bound
+
+    best_value = 0
+    best_chosen = []
+    chosen = []
+    remaining = list(capacities)
+    # Each frame is (position, value, returning). returning is set when the search comes back from taking the
+    # item at position: that take is undone and the skip branch follows, so takes are explored before skips.
+    stack = [(0, 0, False)]
+    while stack:
+        position, value, returning = stack.pop()
+        if returning:
+            chosen.pop()
+            for k in dimensions:
+                remaining[k] += requirements[position][k]
+            # Option 2: skip current item
+            stack.append((position + 1, value, False))
+            continue
+        if value > best_value:
+            best_value = value
+            best_chosen = list(chosen)
+        if position == len(candidates) or upper_bound(position, value, remaining) <= best_value:
+            continue
+        # Option 1: take current item, if it fits
+        if all(requirements[position][k] <= remaining[k] for k in dimensions):
+            for k in dimensions:
+                remaining[k] -= requirements[position][k]
+            chosen.append(position)
+            stack.append((position, value, True))
+            stack.append((position + 1, value + values[position], False))
+        else:
+            stack.append((position + 1, value, False))
+    return best_value, tuple(candidates[position] for position in best_chosen)
+
+def dp_table_fits(cells: int, number_of_items: int) -> bool:
+    # a dp table keeps one value per cell and one decision bit per cell and item
+    return cells * 8 + cells * number_of_items // 8 <= DP_MAX_BYTES
+
+def subset_sums(items: list[Item]) -> tuple[list[int], list[int]]:
+    # built by doubling, so position i in the lists is the subset whose bit j is set if items[j] is taken
+    weights = [0]
+    values = [0]
+    for item in items:
+        weights += [weight + item.requirements[0] for weight in weights]
+        values += [value + item.value for value in values]
+    return weights, values
+
+def solve_meet_in_the_middle_knapsack_01(capacity: int, items: list[Item]) -> tuple[int, tuple[Item]]:
+    """1-dimensional 0/1 knapsack in O(2^(n/2) * n), independent of the capacity.
+
+    The subset sums of the second half are sorted by weight and pruned to a Pareto front where a 
+    heavier subset is only kept if it is also more valuable. Every subset of the first half then 
+    binary searches that front for the best partner that still fits. Chosen items are rebuilt 
+    from the two subset masks.
+    """
+    half = len(items) // 2
+    first_items, second_items = items[:half], items[half:]
+    first_weights, first_values = subset_sums(first_items)
+    second_weights, second_values = subset_sums(second_items)
+
+    front_weights = []
+    front_values = []
+    front_masks = []
+    for mask in sorted(range(len(second_weights)), key=second_weights.__getitem__):
+        if second_weights[mask] > capacity:
+            break
+        if front_values and second_values[mask] <= front_values[-1]:
+            continue
+        front_weights.append(second_weights[mask])
+        front_values.append(second_values[mask])
+        front_masks.append(mask)
+
+    value_to_return = 0
+    best_masks = (0, 0)
+    for mask, weight in enumerate(first_weights):
+        if weight > capacity:
+            continue
+        position = bisect.bisect_right(front_weights, capacity - weight) - 1
+        value = first_values[mask] + front_values[position]
+        if value > value_to_return:
+            value_to_return = value
+            best_masks = (mask, front_masks[position])
+
+    first_mask, second_mask = best_masks
+    items_to_return = tuple(item for i, item in enumerate(first_items) if first_mask >> i & 1)
+    items_to_return += tuple(item for i, item in enumerate(second_items) if second_mask >> i & 1)
+    return value_to_return, items_to_return
 
 def solve_1_knapsack_01(capacity: int, items: list[Item]):
-    number_of_items = len(items)
-    # initialize zeroes
-    dp = [[0] * (capacity + 1) for _ in range(number_of_items + 1)]
-    # loop over all items, and all capacities up till the actual capacity
-    # ranges are +1 because we need to track 0 items and 0 capacity as an option
-    for current_item_plus_one_index in range(1, number_of_items + 1):
-        current_item = items[current_item_plus_one_index - 1]
-        for current_capacity in range(capacity + 1):
-            current_item_requirement = current_item.requirements[0]
-            if current_item_requirement <= current_capacity:
-                dp[current_item_plus_one_index][current_capacity] = max(dp[current_item_plus_one_index - 1][current_capacity], current_item.value + dp[current_item_plus_one_index - 1][current_capacity - current_item_requirement])
-            else:
-                dp[current_item_plus_one_index][current_capacity] = dp[current_item_plus_one_index - 1][current_capacity]
-    value_to_return = dp[-1][-1]
-    # backtrack to find actual items. Start with the maximum (last value in the matrix), move upwards (item -1), and if there's change, the item was used.
+    if not dp_table_fits(capacity + 1, len(items)):
+        if len(items) <= MEET_IN_THE_MIDDLE_MAX_ITEMS:
+            return solve_meet_in_the_middle_knapsack_01(capacity, items)
+        return solve_branch_and_bound_knapsack_01((capacity,), items)
+    if numpy is not None:
+        return solve_dense_knapsack_01((capacity,), items)
+    # a single dp row, updated in reverse capacity order so every item is used at most once
+    dp = [0] * (capacity + 1)
+    # per item, a packed bit row: bit c is set if taking the item improved capacity c
+    decisions = []
+    for current_item in items:
+        current_item_requirement = current_item.requirements[0]
+        taken = bytearray((capacity >> 3) + 1)
+        for current_capacity in range(capacity, current_item_requirement - 1, -1):
+            take = current_item.value + dp[current_capacity - current_item_requirement]
+            if take > dp[current_capacity]:
+                dp[current_capacity] = take
+                taken[current_capacity >> 3] |= 1 << (current_capacity & 7)
+        decisions.append(taken)
+    value_to_return = dp[-1]
+    # backtrack to find actual items. Start with the full capacity, move from the last item to the first, and follow the take bits.
     items_to_return = ()
     current_capacity = capacity
-    for current_item_plus_one_index in range(number_of_items, 0, -1):
-        if dp[current_item_plus_one_index][current_capacity] == dp[current_item_plus_one_index-1][current_capacity]:
+    for current_item_index in range(len(items) - 1, -1, -1):
+        if not decisions[current_item_index][current_capacity >> 3] >> (current_capacity & 7) & 1:
             continue
-        item = items[current_item_plus_one_index - 1]
+        item = items[current_item_index]
         items_to_return += (item,)
         current_capacity -= item.requirements[0]
     return value_to_return, items_to_return
 
+def max_orders_fitting(capacity: int, requirements: list[int]) -> int:
+    # taking the smallest requirements first gives the most items that can fit in one dimension
+    count = 0
+    for requirement in sorted(requirements):
+        if requirement > capacity:
+            break
+        capacity -= requirement
+        count += 1
+    return count
+
+def solve_2_knapsack_uniform(capacity: tuple[int], items: list[Item], reconstruct: bool = True) -> tuple[int, tuple[Item]]:
+    """2-dimensional 0/1 knapsack where every item has the same value, so only the number of items counts.
+
+    The table maps (items taken, first resource used) to the least second resource used, so its size is 
+    bounded by (max items that fit) x (first capacity) instead of first x second capacity. The smaller 
+    capacity is used as the first resource. With reconstruct=False no decision bits are kept and the 
+    returned items are empty.
+    """
+    if not items or items[0].value <= 0:
+        return 0, ()
+    swap = capacity[1] < capacity[0]
+    capacity_a, capacity_b = (capacity[1], capacity[0]) if swap else (capacity[0], capacity[1])
+    requirements = [(item.requirements[1], item.requirements[0]) if swap else tuple(item.requirements) for item in items]
+    max_orders = min(max_orders_fitting(capacity_a, [requirement[0] for requirement in requirements]), max_orders_fitting(capacity_b, [requirement[1] for requirement in requirements]))
+    # capacity_b + 1 means "not possible"
+    impossible = capacity_b + 1
+    decisions = []
+    if numpy is not None:
+        dp = numpy.full((max_orders + 1, capacity_a + 1), impossible, dtype=numpy.int64)
+        dp[0, :] = 0
+        for requirement_a, requirement_b in requirements:
+            if requirement_a > capacity_a or max_orders == 0:
+                decisions.append(None)
+                continue
+            take = dp[:-1, :capacity_a + 1 - requirement_a] + requirement_b
+            improved = take < dp[1:, requirement_a:]
+            dp[1:, requirement_a:] = numpy.where(improved, take, dp[1:, requirement_a:])
+            decisions.append((numpy.packbits(improved, axis=None), improved.shape) if reconstruct else None)
+        least_b_used = dp[:, capacity_a].tolist()
+    else:
+        # dp[k][a]: least second resource used by k items using at most a of the first resource
+        dp = [[0] * (capacity_a + 1)] + [[impossible] * (capacity_a + 1) for _ in range(max_orders)]
+        for current_item_index, (requirement_a, requirement_b) in enumerate(requirements):
+            taken = bytearray(((max_orders + 1) * (capacity_a + 1) >> 3) + 1) if reconstruct else None
+            for orders in range(min(current_item_index + 1, max_orders), 0, -1):
+                previous_row = dp[orders - 1]
+                row = dp[orders]
+                for current_capacity in range(capacity_a, requirement_a - 1, -1):
+                    take = previous_row[current_capacity - requirement_a] + requirement_b
+                    if take < row[current_capacity]:
+                        row[current_capacity] = take
+                        if reconstruct:
+                            bit = orders * (capacity_a + 1) + current_capacity
+                            taken[bit >> 3] |= 1 << (bit & 7)
+            decisions.append(taken)
+        least_b_used = [row[capacity_a] for row in dp]
+    orders_to_return = max(orders for orders, used in enumerate(least_b_used) if used <= capacity_b)
+    items_to_return = ()
+    if reconstruct:
+        # backtrack from (orders taken, full first capacity), last item first, following the improved bits
+        orders = orders_to_return
+        current_capacity = capacity_a
+        for current_item_index in range(len(items) - 1, -1, -1):
+            if orders == 0:
+                break
+            decision = decisions[current_item_index]
+            requirement_a = requirements[current_item_index][0]
+            if decision is None or current_capacity < requirement_a:
+                continue
+            if numpy is not None:
+                bits, shape = decision
+                bit = int(numpy.ravel_multi_index((orders - 1, current_capacity - requirement_a), shape))
+                is_taken = bits[bit >> 3] >> (7 - (bit & 7)) & 1
+            else:
+                bit = orders * (capacity_a + 1) + current_capacity
+                is_taken = decision[bit >> 3] >> (bit & 7) & 1
+            if not is_taken:
+                continue
+            items_to_return += (items[current_item_index],)
+            orders -= 1
+            current_capacity -= requirement_a
+    return orders_to_return * items[0].value, items_to_return
+
 def solve_2_knapsack_01(capacity: tuple[int], items: list[Item]):
+    cells = (capacity[0] + 1) * (capacity[1] + 1)
+    if items and all(item.value == items[0].value for item in items):
+        max_orders = min(max_orders_fitting(capacity[0], [item.requirements[0] for item in items]), max_orders_fitting(capacity[1], [item.requirements[1] for item in items]))
+        uniform_cells = (max_orders + 1) * (min(capacity) + 1)
+        if uniform_cells < cells and dp_table_fits(uniform_cells, len(items)):
+            return solve_2_knapsack_uniform(capacity, items)
+    if not dp_table_fits(cells, len(items)):
+        return solve_branch_and_bound_knapsack_01(tuple(capacity), items)
+    if numpy is not None:
+        return solve_dense_knapsack_01(tuple(capacity), items)
     number_of_items = len(items)
     # initialize zeroes
     dp = [[[0] * (capacity[1] + 1) for _ in range (capacity[0] + 1)] for _ in range(number_of_items + 1)]
@@ -66,43 +357,160 @@ def solve_2_knapsack_01(capacity: tuple[int], items: list[Item]):
         current_capacity_1 -= item.requirements[1]
     return value_to_return, items_to_return
 
-def solve_n_knapsack_01(capacities: tuple[int], items: list[Item], item_index: int = 0, memo: typing.Union[None, dict[tuple[int, tuple[int]]]] = None) -> tuple[int, tuple[Item]]:
-    if memo is None:
-        memo = {}
-    
-    # End of list
-    if item_index == len(items):
-        return 0, tuple()
-    
-    # State in memo
-    state = (item_index, capacities)
-    if state in memo:
-        return memo[state]
-    
-    # Option 1: skip current item:
-    result_weight, result_items = solve_n_knapsack_01(tuple(capacities), items, item_index + 1, memo)
+def pareto_frontier(states: dict[tuple[int], tuple[int, typing.Any]]) -> dict[tuple[int], tuple[int, typing.Any]]:
+    """Keeps the Pareto-undominated states: a state is dropped if another one uses no more of every resource
+    and has at least the same value.
 
-    # Option 2: take current item
-    current_item = items[item_index]
-    fits_in_knapsack = all(requirement <= current_capacity for current_capacity, requirement in zip(capacities, current_item.requirements))
-    
-    result_items_with = None
-    if fits_in_knapsack:
-        new_capacities = tuple(current_capacity - requirement for current_capacity, requirement in zip(capacities, current_item.requirements))
-        result_weight_with, result_items_with = solve_n_knapsack_01(new_capacities, items, item_index + 1, memo)
-        result_weight_with += current_item.value
-        result_items_with = (current_item,) + result_items_with
-    
-    if result_items_with and result_weight_with > result_weight:
-        result_items = result_items_with
-        result_weight = result_weight_with
-    
-    memo[state] = result_weight, result_items
-    return result_weight, result_items
+    States are visited by decreasing value, then increasing total use, so a state can only be dominated by
+    one that is already kept. With one or two resources the kept usages form a staircase that answers this
+    with a binary search. With more resources, per-resource Fenwick trees of kept-state bitmasks answer it
+    with O(log S) big-int operations per resource.
+    """
+    ordered = sorted(states.items(), key=lambda state: (-state[1][0], sum(state[0])))
+    kept = {}
+    if len(ordered[0][0]) <= 2:
+        # staircase of kept usages: first resource increasing, second resource decreasing
+        firsts = []
+        seconds = []
+        for used, entry in ordered:
+            first, second = used if len(used) == 2 else (used[0], 0)
+            # the step with the largest first usage <= first has the least second usage among them
+            position = bisect.bisect_right(firsts, first)
+            if position and seconds[position - 1] <= second:
+                continue
+            kept[used] = entry
+            # steps the new usage dominates are replaced by it
+            start = bisect.bisect_left(firsts, first)
+            end = start
+            while end < len(firsts) and seconds[end] >= second:
+                end += 1
+            firsts[start:end] = [first]
+            seconds[start:end] = [second]
+        return kept
+    # Per resource, a Fenwick tree over the distinct usages in this layer whose nodes are bitmasks of kept
+    # states. OR-ing a prefix gives the kept states using no more of that resource, and a state is
+    # dominated if those sets intersect over all resources.
+    dimensions = range(len(ordered[0][0]))
+    ranks = [{amount: rank for rank, amount in enumerate(sorted({used[k] for used, _ in ordered}), 1)} for k in dimensions]
+    trees = [[0] * (len(ranks[k]) + 1) for k in dimensions]
+    for used, entry in ordered:
+        candidates = -1
+        for k in dimensions:
+            tree = trees[k]
+            at_most = 0
+            position = ranks[k][used[k]]
+            while position:
+                at_most |= tree[position]
+                position &= position - 1
+            candidates &= at_most
+            if not candidates:
+                break
+        if candidates:
+            continue
+        bit = 1 << len(kept)
+        kept[used] = entry
+        for k in dimensions:
+            tree = trees[k]
+            position = ranks[k][used[k]]
+            while position < len(tree):
+                tree[position] |= bit
+                position += position & -position
+    return kept
+
+def solve_n_knapsack_01(capacities: tuple[int], items: list[Item], max_states: typing.Union[None, int] = None) -> tuple[int, tuple[Item]]:
+    """0/1 knapsack for any number of dimensions.
+
+    Uses branch and bound when the dp table would not fit, the dense NumPy kernel when the capacity slab has at
+    most DENSE_MAX_CELLS cells, and otherwise a Pareto frontier of used-resource states per item layer.
+
+    Args:
+        max_states: Caps the size of the Pareto frontier, keeping the most valuable states; the result may then be
+            suboptimal. Only applies to the frontier engine, the dense and branch and bound engines ignore it.
+    """
+    cells = 1
+    for capacity in capacities:
+        cells *= capacity + 1
+    if not dp_table_fits(cells, len(items)):
+        return solve_branch_and_bound_knapsack_01(tuple(capacities), items)
+    if numpy is not None and cells <= DENSE_MAX_CELLS:
+        return solve_dense_knapsack_01(tuple(capacities), items)
+
+    # frontier maps used resources to (value, back pointer). A back pointer is (item_index, previous back pointer) for
+    # every taken item, so states share their history and no item tuples are copied.
+    frontier = {tuple(0 for _ in capacities): (0, None)}
+    for item_index, current_item in enumerate(items):
+        # Option 1: skip current item: every state carries over
+        next_frontier = dict(frontier)
+        # Option 2: take current item, where it still fits
+        for used, (value, back_pointer) in frontier.items():
+            new_used = tuple(amount + requirement for amount, requirement in zip(used, current_item.requirements))
+            if any(amount > capacity for amount, capacity in zip(new_used, capacities)):
+                continue
+            new_value = value + current_item.value
+            if new_used not in next_frontier or next_frontier[new_used][0] < new_value:
+                next_frontier[new_used] = (new_value, (item_index, back_pointer))
+        frontier = pareto_frontier(next_frontier)
+        if max_states is not None and len(frontier) > max_states:
+            logger.warning(f'Frontier of {len(frontier)} states cut to {max_states}, result may be suboptimal')
+            frontier = dict(sorted(frontier.items(), key=lambda state: (-state[1][0], sum(state[0])))[:max_states])
+
+    value_to_return, back_pointer = max(frontier.values(), key=lambda entry: entry[0])
+    items_to_return = ()
+    while back_pointer is not None:
+        item_index, back_pointer = back_pointer
+        items_to_return = (items[item_index],) + items_to_return
+    return value_to_return, items_to_return
+
+def split_bounded_items(capacities: tuple[int], items: list[Item]) -> list[tuple[Item, Item, int]]:
+    """Binary splitting: an item with count c becomes 0/1 pieces of 1, 2, 4, ... copies plus a remainder,
+    which can combine into every quantity from 0 to c. Returns (piece, original item, copies) triples."""
+    pieces = []
+    for item in items:
+        # never more copies than fit in the tightest capacity
+        fitting = [capacity // requirement for capacity, requirement in zip(capacities, item.requirements) if requirement > 0]
+        if not fitting:
+            if item.count is None and item.value > 0:
+                raise ValueError(f'Unbounded item without requirements has unbounded value: {item}')
+            fitting = [0 if item.count is None else item.count]
+        count = min(fitting) if item.count is None else min(item.count, min(fitting))
+        copies = 1
+        while count > 0:
+            copies = min(copies, count)
+            piece = Item(item.value * copies, tuple(requirement * copies for requirement in item.requirements))
+            pieces.append((piece, item, copies))
+            count -= copies
+            copies *= 2
+    return pieces
+
+def solve_knapsack_bounded(capacities: tuple[int], items: list[Item]) -> tuple[int, tuple[tuple[Item, int]]]:
+    """Bounded and unbounded knapsack: every item may be taken up to item.count times (None: unbounded).
+
+    The items are binary split into O(log count) 0/1 pieces each and solved with the 0/1 solver for the 
+    number of dimensions, so the table height grows with the sum of log counts instead of the counts.
+
+    Returns:
+        The best value, and (item, quantity) pairs for every item taken at least once.
+    """
+    pieces = split_bounded_items(capacities, items)
+    piece_items = [piece for piece, _, _ in pieces]
+    if len(capacities) == 1:
+        value_to_return, chosen = solve_1_knapsack_01(capacities[0], piece_items)
+    elif len(capacities) == 2:
+        value_to_return, chosen = solve_2_knapsack_01(tuple(capacities), piece_items)
+    else:
+        value_to_return, chosen = solve_n_knapsack_01(tuple(capacities), piece_items)
+    origins = {id(piece): (item, copies) for piece, item, copies in pieces}
+    quantities = {}
+    for piece in chosen:
+        item, copies = origins[id(piece)]
+        _, quantity = quantities.get(id(item), (item, 0))
+        quantities[id(item)] = (item, quantity + copies)
+    return value_to_return, tuple(quantities.values())
 
 def process(stock, orders):
-    value, items = solve_2_knapsack_01(stock, orders)
-    logger.info(f'{value=} {items=}')
+    # every order is worth 1, so only the number of fulfilled orders matters
+    value, _ = solve_2_knapsack_uniform(stock, orders, reconstruct=False)
+    logger.info(f'{value=}')
     return value
 
 if __name__ == "__main__":
@@ -1,3 +1,4 @@
+import array
 import datetime
 import logging
 import os
@@ -6,40 +7,68 @@ import typing
 import itertools
 import bisect
 
+from batch import run_batch
+
+def patience_insert(tails, x, find=bisect.bisect_left):
+    """Places x in the sorted tails list (patience sorting step) and returns its position."""
+    # Find the index where x would fit in the sorted 'tails' list
+    idx = find(tails, x)
+
+    if idx == len(tails):
+        # x is larger than any element in tails, extend the subsequence
+        tails.append(x)
+    else:
+        # Replace the existing element at idx with x
+        # This maintains the smallest possible tail for that length
+        tails[idx] = x
+    return idx
+
 def lis(nums):
-    if not nums:
-        return 0
-    
     tails = []
     for x in nums:
-        # Find the index where x would fit in the sorted 'tails' list
-        idx = bisect.bisect_left(tails, x)
-        
-        if idx == len(tails):
-            # x is larger than any element in tails, extend the subsequence
-            tails.append(x)
-        else:
-            # Replace the existing element at idx with x
-            # This maintains the smallest possible tail for that length
-            tails[idx] = x
-            
+        patience_insert(tails, x)
     return len(tails)
 
-def get_lis_subsequence(nums):
+class Descending:
+    # Reverses the ordering of a value, so bisect can be used for decreasing subsequences
+    __slots__ = ("value",)
+
+    def __init__(self, value):
+        self.value = value
+
+    def __lt__(self, other):
+        return other.value < self.value
+
+
+def get_lis_indices(nums, strict=True, decreasing=False, key=None):
+    """Indices of a longest increasing subsequence of nums, in O(n log n).
+
+    Args:
+        nums: The sequence.
+        strict: Require strictly increasing (or decreasing) values; else equal values may repeat.
+        decreasing: Find a longest decreasing subsequence instead.
+        key: Optional function applied to every element before comparing.
+
+    Returns:
+        An array('i') of indices into nums, in increasing order.
+    """
     if not nums:
-        return []
+        return array.array("i")
 
-    n = len(nums)
-    tails_indices = []  # Stores indices of the smallest tail for each length
-    predecessor = [-1] * n  # Tracks the index of the previous element in the LIS
+    values = nums if key is None else [key(x) for x in nums]
+    if decreasing:
+        values = [Descending(value) for value in values]
+    find = bisect.bisect_left if strict else bisect.bisect_right
 
-    for i, x in enumerate(nums):
-        # We need to compare values, so we use the values at the stored indices
-        current_tails_values = [nums[idx] for idx in tails_indices]
-        idx = bisect.bisect_left(current_tails_values, x)
+    tails_indices = array.array("i")  # Stores indices of the smallest tail for each length
+    tails_values = []  # The values at tails_indices, kept alongside so they are never rebuilt
+    predecessor = array.array("i", [-1]) * len(nums)  # Tracks the index of the previous element in the LIS
+
+    for i, x in enumerate(values):
+        idx = patience_insert(tails_values, x, find)
 
         if idx > 0:
-            # The element before this one in the subsequence is the current tail 
+            # The element before this one in the subsequence is the current tail
             # of the subsequence one length shorter
             predecessor[i] = tails_indices[idx - 1]
 
@@ -49,35 +78,16 @@ def get_lis_subsequence(nums):
             tails_indices[idx] = i
 
     # Reconstruct the subsequence by backtracking through the predecessors
-    lis = []
+    lis = array.array("i", [0]) * len(tails_indices)
     curr = tails_indices[-1]
-    while curr != -1:
-        lis.append(nums[curr])
+    for position in range(len(lis) - 1, -1, -1):
+        lis[position] = curr
         curr = predecessor[curr]
-    
-    return lis[::-1] # Reverse to get the correct order
+    return lis
 
-def get_card_list_int(cards, suit_order):
-    card_values = []
-    for card in cards:
-        suit = card[0]
-        face = card[1:]
-        try:
-            face_int = int(face)
-        except ValueError:
-            match face:
-                case 'B':
-                    face_int = 11
-                case 'V':
-                    face_int = 12
-                case 'H':
-                    face_int = 13
-                case 'A':
-                    face_int = 14
-        suit_index = list(suit_order).index(suit)
-        card_value = face_int + 14 * suit_index
-        card_values.append(card_value)
-    return card_values
+
+def get_lis_subsequence(nums, strict=True, decreasing=False, key=None):
+    return [nums[idx] for idx in get_lis_indices(nums, strict=strict, decreasing=decreasing, key=key)]
 
 def get_valid_orders(suits):
     colors = {
@@ -99,22 +109,48 @@ def get_valid_orders(suits):
             valid_permutations.append(permutation)
     return valid_permutations
 
-def get_suits(cards):
-    suits = set()
+FACE_VALUES = {'B': 11, 'V': 12, 'H': 13, 'A': 14}
+
+def parse_cards(cards):
+    """Parses a hand once into its distinct suits and compact per-card suit ids and face values."""
+    suits = []
+    suit_ids = array.array("i")
+    faces = array.array("i")
     for card in cards:
-        suits.add(card[0])
-    return suits
+        suit = card[0]
+        if suit not in suits:
+            suits.append(suit)
+        suit_ids.append(suits.index(suit))
+        face = card[1:]
+        faces.append(FACE_VALUES[face] if face in FACE_VALUES else int(face))
+    return suits, suit_ids, faces
+
+def lis_lengths(suit_ids, faces, suit_offsets):
+    """LIS length of the hand under every suit ordering, in one pass over the cards.
+
+    suit_offsets holds one lookup table per ordering, mapping a suit id to the value added to
+    the faces of that suit, so an ordering is applied as a remap instead of re-parsing the cards.
+    """
+    tails = [[] for _ in suit_offsets]
+    for suit_id, face in zip(suit_ids, faces):
+        for order_tails, offsets in zip(tails, suit_offsets):
+            patience_insert(order_tails, face + offsets[suit_id])
+    return [len(order_tails) for order_tails in tails]
 
 def solve_task(number_of_cards, cards):
-    suits = get_suits(cards)
+    suits, suit_ids, faces = parse_cards(cards)
     valid_orders = get_valid_orders(suits)
-    min_changes = float('inf')
+    suit_offsets = []
     for order in valid_orders:
-        card_list_int = get_card_list_int(cards, order)
-        changes = int(number_of_cards) - lis(card_list_int)
-        if changes < min_changes:
-            min_changes = changes
-    return min_changes
+        offsets = array.array("i", [0]) * len(suits)
+        for suit_index, suit in enumerate(order):
+            offsets[suits.index(suit)] = 14 * suit_index
+        suit_offsets.append(offsets)
+    return int(number_of_cards) - max(lis_lengths(suit_ids, faces, suit_offsets))
+
+def solve_tasks(tasks, processes=None):
+    """Solves (number_of_cards, cards) tasks in order, over a process pool for many hands."""
+    return run_batch(solve_task, tasks, processes=processes)
 
 
 def read_value(line, cast=None):
@@ -155,15 +191,17 @@ if __name__ == "__main__":
     logger.info(f"Number of entries: {num_entries}")
 
     line_index = 1
+    tasks = []
     for entry in range(num_entries):
         logger.info(f"Reading entry {entry+1} out of {num_entries}")
 
         # Start of parsing
         input_line = read_tuple(input_lines[line_index])
         line_index += 1
+        tasks.append((input_line[0], input_line[1:]))
 
-        # Start of processing
-        value = solve_task(input_line[0], input_line[1:])
+    # Start of processing
+    for entry, value in enumerate(solve_tasks(tasks)):
         solution_str = f"{entry + 1} {value}"
 
         # Write to stdout
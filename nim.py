@@ -0,0 +1,131 @@
+import collections
+import functools
+import heapq
+import typing
+
+
+def is_winning_misere(piles: typing.Sequence[int]) -> bool:
+    """Whether the player to move wins misère Nim (whoever takes the last stone loses).
+
+    Known rule: if every pile has at most one stone, the player to move wins if the number of
+    piles with one stone is even. Otherwise the player to move wins if the XOR of the piles is
+    not zero, exactly as in normal Nim. O(piles), no recursion.
+    """
+    if all(count <= 1 for count in piles):
+        return sum(piles) % 2 == 0
+    return functools.reduce(lambda a, b: a ^ b, piles, 0) != 0
+
+
+def find_all_misere_winning_moves(piles: typing.Sequence[int]) -> list[list[int]]:
+    """All piles a move can leave behind that are losing for the opponent, in O(piles) plus copying out every move.
+
+    For every pile, at most two target sizes can work: the XOR of the other piles (leaving a
+    XOR of zero with some pile above one), or 0/1 stones when every other pile has at most one
+    stone and the resulting number of one-stone piles is odd.
+    """
+    total_xor = functools.reduce(lambda a, b: a ^ b, piles, 0)
+    ones = sum(1 for count in piles if count == 1)
+    # the two largest piles give the largest of the other piles for every pile
+    largest = heapq.nlargest(2, piles) + [0, 0]
+    winning_moves = []
+    for i, count in enumerate(piles):
+        others_xor = total_xor ^ count
+        others_max = largest[1] if count == largest[0] else largest[0]
+        targets = []
+        if others_xor < count and (others_xor > 1 or others_max > 1):
+            targets.append(others_xor)
+        if others_max <= 1:
+            others_ones = ones - (count == 1)
+            for target in (0, 1):
+                if target < count and (others_ones + target) % 2 == 1:
+                    targets.append(target)
+        for target in targets:
+            next_state = list(piles)
+            next_state[i] = target
+            winning_moves.append(next_state)
+    return winning_moves
+
+
+class GameSolver:
+    """Generic win/loss solver for finite, acyclic two-player games, for rule variants without a closed form.
+
+    The search is an explicit-stack depth-first minimax, so deep games cannot hit the recursion
+    limit, and it stops expanding a state as soon as one losing successor is found. Solved states
+    are kept in an LRU cache of at most max_cache entries; evicted states are simply solved again.
+
+    Args:
+        moves: Returns the states reachable in one move. States must be hashable; return them in a
+            canonical form (e.g. sorted piles) to share cache entries.
+        terminal: Returns True/False if the state is decided (the player to move wins/loses), or
+            None to look at the moves. A state without moves that is not terminal is a loss for the
+            player to move.
+        max_cache: Maximum number of cached states.
+    """
+
+    def __init__(self, moves: typing.Callable[[typing.Hashable], typing.Iterable[typing.Hashable]], terminal: typing.Callable[[typing.Hashable], typing.Union[bool, None]] = None, max_cache: int = 10 ** 6):
+        self.moves = moves
+        self.terminal = terminal if terminal is not None else lambda state: None
+        self.max_cache = max_cache
+        self.cache = collections.OrderedDict()
+
+    def known(self, state: typing.Hashable) -> typing.Union[bool, None]:
+        if state in self.cache:
+            self.cache.move_to_end(state)
+            return self.cache[state]
+        return self.terminal(state)
+
+    def remember(self, state: typing.Hashable, winning: bool) -> None:
+        self.cache[state] = winning
+        if len(self.cache) > self.max_cache:
+            self.cache.popitem(last=False)
+
+    def is_winning(self, state: typing.Hashable) -> bool:
+        """Whether the player to move from state wins with perfect play."""
+        result = self.known(state)
+        if result is not None:
+            return result
+        # Each frame is [state, iterator over its successors]; result carries a solved child to its parent
+        stack = [[state, iter(self.moves(state))]]
+        result = None
+        while stack:
+            frame = stack[-1]
+            if result is False:
+                # A move to a losing state: the parent wins, its other moves don't matter
+                self.remember(frame[0], True)
+                stack.pop()
+                result = True
+                continue
+            child = next(frame[1], None)
+            if child is None:
+                # Every move leads to a winning state for the opponent
+                self.remember(frame[0], False)
+                stack.pop()
+                result = False
+                continue
+            result = self.known(child)
+            if result is None:
+                stack.append([child, iter(self.moves(child))])
+        return result
+
+    def winning_moves(self, state: typing.Hashable) -> list[typing.Hashable]:
+        """The successors of state that are losing for the opponent."""
+        return [child for child in self.moves(state) if not self.is_winning(child)]
+
+
+def misere_nim_solver(max_take: typing.Union[None, int] = None, max_cache: int = 10 ** 6) -> GameSolver:
+    """GameSolver for misère Nim on sorted pile tuples, optionally allowing at most max_take stones per move."""
+
+    def moves(piles):
+        successors = set()
+        for i, count in enumerate(piles):
+            for take in range(1, (count if max_take is None else min(count, max_take)) + 1):
+                next_state = list(piles)
+                next_state[i] -= take
+                successors.add(tuple(sorted(next_state)))
+        return successors
+
+    def terminal(piles):
+        # No stones left: the opponent took the last one and lost
+        return True if sum(piles) == 0 else None
+
+    return GameSolver(moves, terminal, max_cache=max_cache)